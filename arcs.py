@@ -0,0 +1,117 @@
+# arcs.py
+# polyline에서 원 위에 놓인 연속된 점들을 찾아 원호(arc) 하나로 묶는 모듈
+# 원, SVG 원호, 원에 가까운 베지어 구간을 수십 번의 회전+전진 대신 몇 번의 arc 명령으로 그리기 위함
+import math
+import numpy as np
+
+
+def _circumcircle(a, b, c):
+    # 세 점을 지나는 원의 중심과 반지름 (한 직선 위면 None)
+    d = 2 * (a[0]*(b[1]-c[1]) + b[0]*(c[1]-a[1]) + c[0]*(a[1]-b[1]))
+    if abs(d) < 1e-12:
+        return None
+    a2, b2, c2 = a[0]**2 + a[1]**2, b[0]**2 + b[1]**2, c[0]**2 + c[1]**2
+    ux = (a2*(b[1]-c[1]) + b2*(c[1]-a[1]) + c2*(a[1]-b[1])) / d
+    uy = (a2*(c[0]-b[0]) + b2*(a[0]-c[0]) + c2*(b[0]-a[0])) / d
+    return (ux, uy), math.hypot(a[0]-ux, a[1]-uy)
+
+def _fit_circle(points, tolerance, max_radius, max_step):
+    # points (k, 2)가 tolerance 안에서 한 원 위에 있고 같은 방향으로 돌면 (center, radius) 반환
+    fit = _circumcircle(points[0], points[len(points)//2], points[-1])
+    if fit is None:
+        return None
+    center, radius = fit
+    if radius > max_radius or radius < tolerance:
+        return None
+
+    # 원호가 polyline에서 벗어나는 거리는 (점과 원 사이 거리) + (현과 원호 사이 거리)까지 될 수 있으므로
+    # tolerance를 반씩 나눠 씀: 모든 점이 원에서 tolerance/2 이내
+    if np.abs(np.hypot(points[:, 0]-center[0], points[:, 1]-center[1]) - radius).max() > tolerance / 2:
+        return None
+
+    # 모든 현이 같은 방향으로 돌고, 현 하나가 너무 큰 각도를 건너뛰지 않음
+    # 점만 원 위에 있으면 양 끝이 짧게 꺾인 긴 직선도 큰 원 위에 놓이므로, 각 현과 원호 사이의 거리
+    # (sagitta) r(1 - cos(θ/2))도 tolerance/2 이내여야 함 → 현 하나가 건너뛸 수 있는 각도를 그만큼 줄임
+    chords = np.diff(points, axis=0)
+    cross = chords[:-1, 0]*chords[1:, 1] - chords[:-1, 1]*chords[1:, 0]
+    if not (np.all(cross > 0) or np.all(cross < 0)):
+        return None
+    lengths = np.hypot(chords[:, 0], chords[:, 1])
+    step = min(math.radians(max_step), 2 * math.acos(1 - tolerance / 2 / radius))
+    if lengths.max() > 2 * radius * math.sin(step / 2):
+        return None
+
+    # 한 바퀴를 넘지 않음
+    if np.sum(2*np.arcsin(np.minimum(1.0, lengths / (2*radius)))) > 2*math.pi + 1e-6:
+        return None
+    return center, radius
+
+def fit_arcs(polyline, tolerance, min_points=4, max_radius=None, max_step=45):
+    # polyline을 ('line', i, i+1) 또는 ('arc', i, j, center, radius) 조각 목록으로 나눔
+    # 원호는 점 i..j를 지나며, 최소 min_points개 점(= min_points-1개 현)을 포함해야 함
+    points = np.asarray(polyline, dtype=np.float64)
+    n = len(points)
+    if max_radius is None:
+        max_radius = tolerance * 1e4
+
+    pieces = []
+    i = 0
+    while i < n - 1:
+        j = i + min_points - 1
+        best = None
+        if j < n:
+            fit = _fit_circle(points[i:j+1], tolerance, max_radius, max_step)
+            if fit is not None:
+                best = (j, fit)
+                # 길이를 두 배씩 늘려 보다가 실패하면 그 사이를 이분 탐색
+                lo, hi = j, None
+                step = min_points - 1
+                while hi is None:
+                    step *= 2
+                    candidate = min(i + step, n - 1)
+                    fit = _fit_circle(points[i:candidate+1], tolerance, max_radius, max_step)
+                    if fit is None:
+                        hi = candidate
+                    else:
+                        lo, best = candidate, (candidate, fit)
+                        if candidate == n - 1:
+                            break
+                while hi is not None and hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    fit = _fit_circle(points[i:mid+1], tolerance, max_radius, max_step)
+                    if fit is None:
+                        hi = mid
+                    else:
+                        lo, best = mid, (mid, fit)
+
+        if best is None:
+            pieces.append(('line', i, i + 1))
+            i += 1
+        else:
+            j, (center, radius) = best
+            pieces.append(('arc', i, j, center, radius))
+            i = j
+    return pieces
+
+def arc_geometry(points, radius):
+    # plan 기준(turn_right = 방향 증가)으로 원호 시작점의 접선 방향, 회전량(sweep, 도), 반지름을 계산
+    # 현의 방향은 양 끝 접선 방향의 중간이므로, 양 끝을 잇는 현 방향에서 sweep의 절반만큼 되돌림
+    # 반지름도 양 끝점을 정확히 지나도록 다시 맞춰서 원호 뒤의 직선 이동이 어긋나지 않게 함
+    points = np.asarray(points, dtype=np.float64)
+    chords = np.diff(points, axis=0)
+    headings = np.degrees(np.arctan2(-chords[:, 1], chords[:, 0]))
+    turns = (np.diff(headings) + 180) % 360 - 180
+    sign = 1.0 if turns.sum() > 0 else -1.0
+
+    lengths = np.hypot(chords[:, 0], chords[:, 1])
+    angles = np.degrees(2*np.arcsin(np.minimum(1.0, lengths / (2*radius))))
+    sweep = sign * angles.sum()
+
+    if abs(sweep) > 270:
+        # 거의 한 바퀴면 양 끝을 잇는 현이 너무 짧아 방향이 불안정하므로 첫 현 기준으로 계산
+        start_heading = headings[0] - sign * angles[0] / 2
+    else:
+        dx, dy = points[-1] - points[0]
+        start_heading = math.degrees(math.atan2(-dy, dx)) - sweep / 2
+        radius = math.hypot(dx, dy) / (2 * math.sin(math.radians(abs(sweep)) / 2))
+    return float(start_heading), float(sweep), float(radius)
@@ -0,0 +1,159 @@
+# batch.py
+# 여러 SVG 파일을 차례로 그리는 작업 실행기
+#   - 다음 그림들의 파싱/근사/최적화는 ProcessPoolExecutor에서 미리 계산 (plan은 .plan_cache에 저장)
+#   - 로봇 여러 대가 각자 스레드에서 준비된 그림을 하나씩 가져가 그림
+# 실행: python batch.py drawings/ a.svg b.svg [--robots 2] [--backend sim] [--workers 4]
+import io
+import os
+import sys
+import time
+import glob
+import queue
+import argparse
+import threading
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+
+def find_svgs(inputs):
+    # 파일과 디렉터리(안의 *.svg, 이름 순)를 받아 SVG 파일 목록으로 펼침
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(sorted(glob.glob(os.path.join(item, "*.svg"))))
+        else:
+            files.append(item)
+    return files
+
+def plan_job(svg_file_path, cache_dir, params):
+    # 작업 프로세스에서 실행: 캐시에 있으면 불러오고 없으면 파싱 → 최적화 → 컴파일 후 저장
+    from plan_cache import cached_plan
+    started = time.perf_counter()
+    # 작업 프로세스의 진행 메시지는 숨김 (결과는 로봇 스레드가 그림 단위로 출력)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plan, cached = cached_plan(svg_file_path, cache_dir, return_cached=True, **params)
+    return plan, cached, time.perf_counter() - started
+
+
+class BatchRunner:
+    def __init__(self, robots, workers=None, cache_dir=".plan_cache", models=None, **params):
+        # robots: create_robot()로 만든 로봇 목록, models: 로봇별 MotionModel (없으면 보정 없음)
+        # params: cached_plan()의 인자 (order, unit, paper_size, scale, tolerance, arc_tolerance, ...)
+        self.robots = robots
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.models = models or [None] * len(robots)
+        self.params = params
+        self.results = []
+        self._lock = threading.Lock()
+
+    def _draw(self, index, jobs):
+        from pose import PoseExecutor
+        h = self.robots[index]
+        while True:
+            try:
+                svg_file_path, future = jobs.get_nowait()
+            except queue.Empty:
+                return
+            result = {"file": svg_file_path, "robot": index}
+            waited = time.perf_counter()
+            try:
+                plan, result["cached"], result["plan_time"] = future.result()
+                result["wait_time"] = time.perf_counter() - waited
+                # 결과는 그림 단위로 보고하므로 path 표시 명령은 빼고 실행
+                # (redirect_stdout은 프로세스 전체에 걸려서 다른 로봇 스레드의 출력까지 가려짐)
+                plan = [command for command in plan if command[0] not in ("path_start", "path_end")]
+                started = time.perf_counter()
+                PoseExecutor(h, self.models[index]).run(plan)
+                result["draw_time"] = time.perf_counter() - started
+                result["commands"] = len(plan)
+            except Exception as error:
+                result["error"] = f"{type(error).__name__}: {error}"
+            with self._lock:
+                self.results.append(result)
+                self.report(result)
+
+    def report(self, result):
+        name = os.path.basename(result["file"])
+        if "error" in result:
+            print(f"[robot {result['robot']}] {name}: FAILED ({result['error']})")
+        else:
+            source = "cache" if result["cached"] else f"planned in {result['plan_time']:.2f} s"
+            print(f"[robot {result['robot']}] {name}: {result['commands']} commands, {source}, "
+                  f"waited {result['wait_time']:.2f} s, drew in {result['draw_time']:.2f} s")
+
+    def run(self, svg_files):
+        # 모든 파일의 plan 계산을 먼저 맡겨 두고, 로봇은 앞에서부터 하나씩 가져가 그림
+        # (로봇이 그리는 동안 다음 파일들의 plan이 다른 프로세스에서 계산됨)
+        started = time.perf_counter()
+        jobs = queue.Queue()
+        with ProcessPoolExecutor(self.workers) as pool:
+            for svg_file_path in svg_files:
+                jobs.put((svg_file_path, pool.submit(plan_job, svg_file_path, self.cache_dir, self.params)))
+            threads = [threading.Thread(target=self._draw, args=(i, jobs)) for i in range(len(self.robots))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        done = sum(1 for result in self.results if "error" not in result)
+        return {
+            "drawings": done,
+            "failed": len(self.results) - done,
+            "elapsed": elapsed,
+            "drawings_per_hour": done / elapsed * 3600 if elapsed > 0 else 0.0,
+            "results": self.results,
+        }
+
+
+if __name__ == "__main__":
+    from robots import create_robot
+    from pose import load_calibration
+
+    parser = argparse.ArgumentParser(description="여러 SVG 파일을 로봇 여러 대로 차례로 그리기")
+    parser.add_argument("inputs", nargs="+", help="SVG 파일 또는 SVG 파일이 들어 있는 디렉터리")
+    parser.add_argument("--robots", type=int, default=1, help="로봇 수")
+    parser.add_argument("--backend", default="roboid", choices=["roboid", "sim"])
+    parser.add_argument("--names", nargs="+", help="로봇별 보정값 이름 (calibration.json)")
+    parser.add_argument("--workers", type=int, help="plan 계산 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--cache-dir", default=".plan_cache")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="sim 백엔드에서 실제로 기다리는 시간 비율 (처리량은 시뮬레이션 시간으로 환산)")
+    parser.add_argument("--scale", type=float, default=0.07)
+    parser.add_argument("--paper-size", type=float, nargs=2, metavar=("WIDTH", "HEIGHT"),
+                        help="종이 크기(cm)에 맞춰 그림 (지정하면 scale은 1)")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--arc-tolerance", type=float, default=0.05)
+    parser.add_argument("--simplify-tolerance", type=float, default=0.03)
+    parser.add_argument("--no-reverse", action="store_true", help="후진 없이 그림")
+    parser.add_argument("--no-order", action="store_true", help="path 순서 최적화 생략")
+    args = parser.parse_args()
+
+    svg_files = find_svgs(args.inputs)
+    if not svg_files:
+        sys.exit("SVG 파일이 없습니다.")
+
+    params = dict(order=not args.no_order, tolerance=args.tolerance, arc_tolerance=args.arc_tolerance,
+                  simplify_tolerance=args.simplify_tolerance, reverse=not args.no_reverse)
+    if args.paper_size:
+        params.update(unit="cm", paper_size=tuple(args.paper_size), scale=1.0)
+    else:
+        params.update(scale=args.scale)
+
+    if args.backend == "sim":
+        robots = [create_robot("sim", realtime=True, time_scale=args.time_scale) for _ in range(args.robots)]
+    else:
+        robots = [create_robot(args.backend) for _ in range(args.robots)]
+    names = args.names or ["default"] * args.robots
+    models = [load_calibration(robot_name=name) for name in names]
+
+    report = BatchRunner(robots, args.workers, args.cache_dir, models, **params).run(svg_files)
+
+    print(f"{report['drawings']} drawings ({report['failed']} failed) in {report['elapsed']:.1f} s: "
+          f"{report['drawings_per_hour']:.1f} drawings/hour")
+    if args.backend == "sim":
+        # 시뮬레이션은 줄인 시간으로 기다렸으므로 가장 오래 일한 로봇의 시뮬레이션 시간으로 환산
+        # (plan 계산을 기다린 시간은 포함되지 않음)
+        busiest = max(robot.elapsed for robot in robots)
+        if busiest > 0:
+            print(f"Simulated: {busiest:.1f} s of drawing, {report['drawings'] / busiest * 3600:.1f} drawings/hour")
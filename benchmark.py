@@ -0,0 +1,339 @@
+# benchmark.py
+# parse → order → flatten → compile → execute(시뮬레이션) 단계별 성능 측정
+# 실행: python benchmark.py [--sizes 10 100 1000] [--output benchmark.json] [--compare 이전결과.json] [--startup]
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import shutil
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+
+from svg_parser import parse_svg
+from path_planner import order_paths
+from flatten import flatten_paths, iter_polylines
+from simplify import simplify_polylines
+from motion_plan import polyline_commands, coalesce_commands, count_motion, run_commands, flatten_tolerance
+from robots import SimulatedTurtle
+
+BENCHMARK_VERSION = 1
+
+
+# --- 합성 SVG 생성 ---
+def _svg(body, width=1000, height=1000):
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">\n'
+            f'{body}\n</svg>\n')
+
+def synthetic_svg(kind, n, seed=0):
+    rng = random.Random(seed)
+    point = lambda: f"{rng.uniform(0, 1000):.2f},{rng.uniform(0, 1000):.2f}"
+
+    if kind == "paths":
+        # 짧은 직선 path n개 (transit이 많은 그림)
+        body = "\n".join(f'<path d="M{point()} L{point()} L{point()}"/>' for _ in range(n))
+    elif kind == "curves":
+        # 3차 베지어 n개로 이루어진 path 하나 (곡선 밀도가 높은 그림)
+        d = f"M{point()} " + " ".join(f"C{point()} {point()} {point()}" for _ in range(n))
+        body = f'<path d="{d}"/>'
+    elif kind == "traced":
+        # 트레이싱 결과처럼 아주 짧은 직선 n개로 이루어진 흔들리는 곡선 path 하나
+        x, y = 500.0, 500.0
+        points = []
+        for i in range(n):
+            x += 2 * math.cos(i / 50) + rng.uniform(-0.1, 0.1)
+            y += 2 * math.sin(i / 70) + rng.uniform(-0.1, 0.1)
+            points.append(f"{x:.2f},{y:.2f}")
+        body = f'<path d="M{" L".join(points)}"/>'
+    elif kind == "circles":
+        body = "\n".join(f'<circle cx="{rng.uniform(0, 1000):.2f}" cy="{rng.uniform(0, 1000):.2f}" '
+                         f'r="{rng.uniform(2, 50):.2f}"/>' for _ in range(n))
+    else:
+        raise ValueError(f"알 수 없는 합성 SVG 종류입니다: {kind}")
+    return _svg(body)
+
+
+# --- 단계 측정 ---
+def _measure(fn, *args, repeat=1):
+    # 시간은 tracemalloc 없이 repeat번 중 최솟값, 메모리는 한 번 더 실행해 최대 사용량 측정
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, {"time": best, "peak_bytes": peak}
+
+# --- 그린 결과 검사 ---
+class _PathTracer(SimulatedTurtle):
+    # path마다 trace의 어느 구간이 그리는 중이었는지 기록 (transit은 검사하지 않음)
+    def reset(self):
+        super().reset()
+        self.path_ranges = []
+
+    def path_started(self, index):
+        self.path_ranges.append((index, len(self.trace) - 1))
+
+    def path_ended(self, index):
+        start_index, start = self.path_ranges[-1]
+        self.path_ranges[-1] = (start_index, start, len(self.trace))
+
+def trace_error(robot, polylines, scale):
+    # 그리는 동안 지나간 점(원호는 10도 간격)과 그 path의 polyline 사이 최대 거리 (cm)
+    # 로봇은 첫 path의 시작점에서 출발하며 시뮬레이션 좌표는 plan과 같은 축 방향 (원점만 다름)
+    origin = polylines[0][0]
+    worst = 0.0
+    for index, start, end in robot.path_ranges:
+        line = (np.asarray(polylines[index], dtype=np.float64) - origin) * scale
+        trace = np.asarray(robot.trace[start:end], dtype=np.float64)
+        if len(line) == 1:
+            worst = max(worst, float(np.hypot(*(trace - line[0]).T).max()))
+            continue
+        a, ab = line[:-1], np.diff(line, axis=0)
+        length2 = np.where(np.einsum('ij,ij->i', ab, ab) > 0, np.einsum('ij,ij->i', ab, ab), 1.0)
+        # (trace 점 수 × 선분 수) 배열이 너무 커지지 않도록 점을 나눠서 계산
+        chunk = max(1, 1_000_000 // len(a))
+        for i in range(0, len(trace), chunk):
+            offset = trace[i:i+chunk, None, :] - a
+            t = np.clip(np.einsum('kij,ij->ki', offset, ab) / length2, 0.0, 1.0)
+            distance = np.hypot(*(offset - ab * t[..., None]).transpose(2, 0, 1))
+            worst = max(worst, float(distance.min(axis=1).max()))
+    return worst
+
+
+def _execute(plan):
+    # plan을 _PathTracer로 실행 (run_commands의 path 출력은 숨김)
+    robot = _PathTracer()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            run_commands(robot, plan)
+        finally:
+            sys.stdout = stdout
+    return robot
+
+
+def benchmark_file(svg_file_path, scale=0.07, tolerance=0.1, order=True, repeat=1, simplify_tolerance=0.03,
+                   arc_tolerance=0.05, reverse=True):
+    # reverse: hamster.py / batch.py처럼 후진을 쓰는 plan을 측정하고, 후진 없는 plan과 결과를 비교
+    stages = {}
+    tolerance = flatten_tolerance(tolerance, arc_tolerance)
+    svg_tolerance = tolerance / scale if tolerance is not None else None
+
+    parsed_paths, stages["parse"] = _measure(parse_svg, svg_file_path, repeat=repeat)
+    n_paths = len(parsed_paths)
+    n_segments = int(len(parsed_paths.kinds))
+
+    if order:
+        (parsed_paths, order_report), stages["order"] = _measure(order_paths, parsed_paths, repeat=repeat)
+    else:
+        order_report = None
+
+    (points, offsets), stages["flatten"] = _measure(flatten_paths, parsed_paths, svg_tolerance, repeat=repeat)
+    n_points = int(len(points))
+    removed = 0
+    if simplify_tolerance is not None:
+        (points, offsets, removed), stages["simplify"] = _measure(simplify_polylines, points, offsets,
+                                                                  simplify_tolerance / scale, repeat=repeat)
+    polylines = [polyline.tolist() for polyline in iter_polylines(points, offsets)]
+
+    commands, stages["commands"] = _measure(polyline_commands, polylines, scale, 0, arc_tolerance, reverse,
+                                            repeat=repeat)
+    plan, stages["coalesce"] = _measure(coalesce_commands, commands, repeat=repeat)
+    robot, stages["execute"] = _measure(_execute, plan, repeat=repeat)
+    summary = robot.summary()
+
+    result = {
+        "paths": n_paths,
+        "segments": n_segments,
+        "points": n_points,
+        "simplified": removed,
+        "commands_raw": count_motion(commands),
+        "commands": count_motion(plan),
+        "transit_before": order_report["transit_before"] if order_report else None,
+        "transit_after": order_report["transit_after"] if order_report else None,
+        "estimated_time": summary["estimated_time"],
+        "arcs": sum(1 for op, _ in plan if op == "arc"),
+        "rotation": summary["rotation"],
+        "trace_error": trace_error(robot, polylines, scale) if polylines else 0.0,
+        "arc_tolerance": arc_tolerance,
+        "reverse": reverse,
+        "stages": stages,
+        "total_time": sum(stage["time"] for stage in stages.values()),
+    }
+    if reverse:
+        # 후진 회귀 검사용: 같은 polyline을 전진만으로 그린 결과 (시간은 측정하지 않음)
+        forward_robot = _execute(coalesce_commands(polyline_commands(polylines, scale, 0, arc_tolerance)))
+        result["rotation_forward"] = forward_robot.summary()["rotation"]
+        result["trace_error_forward"] = trace_error(forward_robot, polylines, scale) if polylines else 0.0
+    return result
+
+
+# --- 시작 시간 ---
+# 모드별로 새 파이썬 프로세스에서 hamster.py를 실행해(설정값만 바꿔서) 프로세스가 끝날 때까지의 시간과
+# 불러온 무거운 모듈을 잼. 캐시된 plan을 실행할 때는 로봇 백엔드 외의 무거운 모듈이 없어야 함
+HEAVY_MODULES = ("numpy", "scipy", "svgpathtools", "roboid")
+STARTUP_MODES = {
+    # 이름: (hamster.py 설정, plan 캐시를 미리 채워 둘지)
+    "compile": ({"ROBOT_BACKEND": "sim"}, False),
+    "replay": ({"ROBOT_BACKEND": "sim"}, True),
+    "dry_run": ({"DRY_RUN": True}, True),
+}
+
+def _hamster_script(svg_file_path, **constants):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "hamster.py"), encoding="utf-8") as f:
+        source = f.read()
+    constants = {"svg_file_path": os.path.abspath(svg_file_path), "CHECKPOINT_FILE": None, **constants}
+    for name, value in constants.items():
+        source, count = re.subn(rf"^{name} = .*$", lambda _: f"{name} = {value!r}", source, count=1, flags=re.M)
+        if not count:
+            raise ValueError(f"hamster.py에 {name} 설정이 없습니다")
+    return source + ("\nimport sys, json\n"
+                     f"print('HEAVY_MODULES', json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n")
+
+def startup_times(svg_file_path="Mouse.svg", repeat=3):
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (repo_dir, os.environ.get("PYTHONPATH")))))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def launch(args):
+            t = time.perf_counter()
+            output = subprocess.run(args, cwd=tmp_dir, env=env, capture_output=True, text=True, check=True).stdout
+            return time.perf_counter() - t, output
+
+        # 기준: 아무것도 하지 않는 파이썬 프로세스
+        results["python"] = {"time": min(launch([sys.executable, "-c", "pass"])[0] for _ in range(repeat)),
+                             "modules": []}
+        for mode, (constants, warm) in STARTUP_MODES.items():
+            script_path = os.path.join(tmp_dir, f"hamster_{mode}.py")
+            with open(script_path, "w", encoding="utf-8") as f:
+                f.write(_hamster_script(svg_file_path, **constants))
+            cache_dir = os.path.join(tmp_dir, ".plan_cache")
+            if warm and not os.path.isdir(cache_dir):
+                launch([sys.executable, script_path])
+            times = []
+            for _ in range(repeat):
+                if not warm:
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                elapsed, output = launch([sys.executable, script_path])
+                times.append(elapsed)
+            results[mode] = {"time": min(times), "modules": json.loads(output.rsplit("HEAVY_MODULES", 1)[1])}
+    return results
+
+
+# --- 전체 실행 ---
+def run_benchmarks(sizes=(10, 100, 1000), kinds=("paths", "curves", "circles", "traced"), real_files=("Mouse.svg",),
+                   repeat=1, **kwargs):
+    results = []
+    for file_path in real_files:
+        if os.path.exists(file_path):
+            result = benchmark_file(file_path, repeat=repeat, **kwargs)
+            results.append({"input": os.path.basename(file_path), "size": None, **result})
+            print(f"{file_path}: {result['total_time']*1e3:.1f} ms, {result['commands']} commands, "
+                  f"{result['arcs']} arcs, trace error {result['trace_error']:.3f} cm, rotation {result['rotation']:.0f} deg")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for kind in kinds:
+            for n in sizes:
+                file_path = os.path.join(tmp_dir, f"{kind}_{n}.svg")
+                with open(file_path, "w") as f:
+                    f.write(synthetic_svg(kind, n))
+                result = benchmark_file(file_path, repeat=repeat, **kwargs)
+                results.append({"input": kind, "size": n, **result})
+                print(f"{kind} x {n}: {result['total_time']*1e3:.1f} ms, {result['commands']} commands, "
+                      f"{result['arcs']} arcs, trace error {result['trace_error']:.3f} cm, rotation {result['rotation']:.0f} deg")
+
+    return {
+        "benchmark_version": BENCHMARK_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+def check_trace_errors(report):
+    # 원호 근사 / 후진 회귀 검사
+    #   - 그린 선(후진 사용, 전진만)이 근사된 polyline에서 arc_tolerance보다 멀어진 입력
+    #   - 후진을 쓴 plan이 전진만 쓴 plan보다 더 많이 회전한 입력
+    errors = []
+    for result in report["results"]:
+        name = f"{result['input']}" + (f" x {result['size']}" if result["size"] else "")
+        tolerance = result.get("arc_tolerance")
+        if tolerance is not None:
+            for key, label in (("trace_error", "trace error"), ("trace_error_forward", "forward-only trace error")):
+                if key in result and result[key] > tolerance:
+                    errors.append(f"{name} {label}: {result[key]:.3f} cm > {tolerance} cm")
+        if "rotation_forward" in result and result["rotation"] > result["rotation_forward"] + 1e-6:
+            errors.append(f"{name} reverse rotation: {result['rotation']:.0f} deg > "
+                          f"{result['rotation_forward']:.0f} deg without reverse")
+    return errors
+
+def compare(previous, current, threshold=1.2, min_delta=0.005):
+    # 같은 입력끼리 단계별 시간과 명령 수를 비교해 threshold 배 이상 나빠진 항목 출력
+    # (min_delta초 미만 차이는 측정 잡음으로 보고 무시)
+    key = lambda result: (result["input"], result["size"])
+    old = {key(result): result for result in previous["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        name = f"{result['input']}" + (f" x {result['size']}" if result["size"] else "")
+        for stage, now in result["stages"].items():
+            prev = before["stages"].get(stage)
+            if (prev and prev["time"] > 0 and now["time"] / prev["time"] >= threshold
+                    and now["time"] - prev["time"] >= min_delta):
+                regressions.append(f"{name} {stage}: {prev['time']*1e3:.1f} ms -> {now['time']*1e3:.1f} ms")
+        if result["commands"] > before["commands"]:
+            regressions.append(f"{name} commands: {before['commands']} -> {result['commands']}")
+    for mode, now in current.get("startup", {}).items():
+        prev = previous.get("startup", {}).get(mode)
+        if prev and now["time"] / prev["time"] >= threshold and now["time"] - prev["time"] >= min_delta:
+            regressions.append(f"startup {mode}: {prev['time']*1e3:.0f} ms -> {now['time']*1e3:.0f} ms")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HamsterS 그리기 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--kinds", nargs="+", default=["paths", "curves", "circles", "traced"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="이전 벤치마크 결과(JSON)와 비교")
+    parser.add_argument("--startup", action="store_true", help="모드별 hamster.py 시작 시간 측정")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.kinds, repeat=args.repeat)
+    if args.startup:
+        report["startup"] = startup_times(repeat=max(args.repeat, 3))
+        for mode, result in report["startup"].items():
+            print(f"startup {mode}: {result['time']*1e3:.0f} ms, heavy modules: {', '.join(result['modules']) or '-'}")
+
+    # 다음 실행에서 --compare로 시작 시간까지 비교할 수 있도록 startup 결과를 채운 뒤 저장
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    errors = check_trace_errors(report)
+    for line in errors:
+        print(f"ERROR {line}")
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+    sys.exit(1 if errors or regressions else 0)
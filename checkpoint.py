@@ -0,0 +1,85 @@
+# checkpoint.py
+# 실행 중 plan의 어디까지 그렸는지(명령 번호, path 번호, 추정 위치)를 작은 JSON 파일에 저장하고,
+# 블루투스 끊김이나 배터리 부족으로 멈춘 뒤 그 지점부터 이어서 그리게 하는 모듈
+#   checkpoint = Checkpoint("checkpoint.json", plan)
+#   PoseExecutor(h, model).run(plan, checkpoint=checkpoint)   → 명령마다 저장, 끝까지 그리면 파일 삭제
+#   resume_plan(PoseExecutor(h, model), plan, checkpoint)      → 저장된 위치로 이동한 뒤 다음 명령부터 실행
+import os
+import json
+import hashlib
+
+
+def plan_fingerprint(plan):
+    # 저장된 checkpoint가 같은 plan에서 나온 것인지 확인하는 용도
+    return hashlib.sha256(repr(plan).encode()).hexdigest()[:16]
+
+def load_checkpoint(file_path="checkpoint.json"):
+    # 저장된 상태 dict (없으면 None)
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path) as f:
+        return json.load(f)
+
+
+class Checkpoint:
+    def __init__(self, file_path="checkpoint.json", plan=None, every=1):
+        # every: 몇 개 명령마다 저장할지 (파일 쓰기는 로봇 명령 하나보다 훨씬 빠르므로 기본은 매 명령)
+        self.file_path = file_path
+        self.fingerprint = plan_fingerprint(plan) if plan is not None else None
+        self.every = every
+        self.path = None
+        self._pending = 0
+
+    def update(self, executor, index, command):
+        # PoseExecutor.run()이 명령 하나를 끝낼 때마다 호출 (index: 다음에 실행할 명령 번호)
+        op, value = command
+        if op == 'path_start':
+            self.path = value
+        elif op == 'path_end':
+            self.path = None
+        self._pending += 1
+        if self._pending >= self.every:
+            self.save(executor, index)
+
+    def save(self, executor, index):
+        # pose: 보정 모델로 추정한 실제 위치, ideal: plan상의 위치 (둘 다 x, y cm, 방향 도)
+        state = {
+            "plan": self.fingerprint,
+            "command": index,
+            "path": self.path,
+            "pose": list(executor.pose),
+            "ideal": list(executor.ideal),
+        }
+        # 쓰는 도중 끊겨도 이전 checkpoint가 남도록 임시 파일에 쓴 뒤 교체
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.file_path)
+        self._pending = 0
+
+    def clear(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+
+def resume_plan(executor, plan, checkpoint, pose=None):
+    # checkpoint에 저장된 지점부터 plan을 이어서 실행 (저장된 것이 없으면 처음부터)
+    # pose: 로봇의 현재 위치 (x, y cm, 방향 도), None이면 멈춘 자리에 그대로 있다고 봄
+    #   로봇을 처음 위치에 다시 놓았다면 (0, 0, model.heading_offset)
+    state = load_checkpoint(checkpoint.file_path)
+    if state is None:
+        return executor.run(plan, checkpoint=checkpoint)
+    if checkpoint.fingerprint is not None and state["plan"] != checkpoint.fingerprint:
+        raise ValueError(f"checkpoint가 다른 plan에서 저장되었습니다: {checkpoint.file_path}")
+
+    executor.pose = tuple(pose) if pose is not None else tuple(state["pose"])
+    executor.ideal = tuple(state["ideal"])
+    print(f"Resuming at command {state['command']} of {len(plan)}"
+          + (f" (Path {state['path']+1})" if state["path"] is not None else ""))
+
+    # 현재 위치에서 저장된 위치로 이동 (방향은 다음 명령이 목표를 향해 다시 계산함)
+    executor.move_to(executor.ideal[:2])
+    checkpoint.path = state["path"]
+    if state["path"] is not None and hasattr(executor.h, 'path_started'):
+        executor.h.path_started(state["path"])
+    return executor.run(plan, start=state["command"], checkpoint=checkpoint)
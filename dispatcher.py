@@ -0,0 +1,87 @@
+# dispatcher.py
+# 명령 계산(planner)과 로봇 명령 전송(dispatcher)을 겹쳐서 실행하는 모듈
+#   - planner 스레드: 명령 iterator(파싱/근사/계획 포함)를 돌며 크기가 정해진 큐를 채움
+#   - dispatcher(호출한 스레드): 큐에서 명령을 꺼내 로봇에 보냄
+# 로봇이 움직이는 동안 다음 명령을 미리 계산하므로 계산 시간이 로봇 동작 시간 뒤에 숨음
+import queue
+import threading
+from motion_plan import run_command
+
+_DONE = object()
+
+
+class Dispatcher:
+    def __init__(self, h, lookahead=64, on_progress=None, poll_interval=0.1, cancelled=None):
+        # lookahead: 미리 계산해 둘 최대 명령 수 (큐가 차면 planner가 기다림 = back-pressure)
+        # on_progress(done, command): 명령 하나를 로봇에 보낼 때마다 호출
+        # cancelled: 호출한 쪽이 가진 threading.Event (set()하면 cancel()과 같음), None이면 새로 만듦
+        self.h = h
+        self.queue = queue.Queue(maxsize=lookahead)
+        self.on_progress = on_progress
+        self.poll_interval = poll_interval
+        self.cancelled = cancelled if cancelled is not None else threading.Event()
+        self.done = 0
+        self.planned = 0
+        self._error = None
+
+    def cancel(self):
+        # 다른 스레드에서 호출하면 현재 명령이 끝난 뒤 멈춤
+        # (Dispatcher를 직접 만들지 않는 dispatch()/execute_path()에서는 cancelled Event를 넘겨서 set())
+        self.cancelled.set()
+
+    def _put(self, item):
+        # 큐가 가득 차 있어도 취소되면 바로 빠져나오도록 짧게 나눠서 기다림
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=self.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, commands):
+        try:
+            for command in commands:
+                if not self._put(command):
+                    return
+                self.planned += 1
+        except BaseException as error:
+            self._error = error
+        finally:
+            self._put(_DONE)
+
+    def run(self, commands):
+        planner = threading.Thread(target=self._produce, args=(commands,), daemon=True)
+        planner.start()
+        try:
+            while not self.cancelled.is_set():
+                try:
+                    command = self.queue.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+                if command is _DONE:
+                    break
+                run_command(self.h, command)
+                self.done += 1
+                if self.on_progress is not None:
+                    self.on_progress(self.done, command)
+        except BaseException:
+            self.cancel()
+            raise
+        finally:
+            # 취소된 경우 큐를 비워서 기다리던 planner가 끝날 수 있게 함
+            if self.cancelled.is_set():
+                while planner.is_alive():
+                    try:
+                        self.queue.get_nowait()
+                    except queue.Empty:
+                        planner.join(self.poll_interval)
+            planner.join()
+
+        if self._error is not None:
+            raise self._error
+        return self.done
+
+
+def dispatch(h, commands, lookahead=64, on_progress=None, cancelled=None):
+    return Dispatcher(h, lookahead, on_progress, cancelled=cancelled).run(commands)
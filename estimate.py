@@ -0,0 +1,175 @@
+# estimate.py
+# 로봇을 움직이지 않고 plan만 보고 명령 수, 이동 거리, 회전 각도, 예상 소요 시간을 계산하는 모듈 (dry run)
+#   - 예상 시간은 명령 종류별 `지연 + 크기 / 속도` 모델이며, instrument.py로 기록한 실제 실행 기록으로 맞출 수 있음
+#   - 여러 파라미터 조합을 빠르게 비교해서 허용되는 것 중 가장 빠른 조합을 고를 수 있음
+# 실행: python estimate.py [SVG 파일] [--fit 기록.json]
+import io
+import json
+import math
+import itertools
+import contextlib
+from pose import fit_linear
+
+
+# --- 속도 모델 ---
+# 회전: turn_latency + |각도| / turn_speed, 이동(전진/후진/원호): move_latency + |거리| / move_speed
+# 기본값은 SimulatedTurtle의 기본 설정과 같음
+class SpeedModel:
+    def __init__(self, turn_latency=0.1, turn_speed=90.0, move_latency=0.1, move_speed=5.0):
+        self.turn_latency = turn_latency
+        self.turn_speed = turn_speed
+        self.move_latency = move_latency
+        self.move_speed = move_speed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+def fit_speed_model(records):
+    # records: instrument.CommandTrace.iter_records()의 tuple 또는 save_json()으로 저장한 dict 목록
+    # 명령 종류별로 걸린 시간 = 지연 + 크기 / 속도 를 최소제곱으로 맞춤 (swing은 반지름을 모르므로 제외)
+    samples = {"turn": [], "move": []}
+    for record in records:
+        if isinstance(record, dict):
+            op, value, duration = record["op"], record["value"], record["duration"]
+        else:
+            _, duration, op, value, _, _ = record
+        if value is None:
+            continue
+        if op in ("turn_left", "turn_right"):
+            samples["turn"].append((abs(value), duration))
+        elif op in ("move_forward", "move_backward"):
+            samples["move"].append((abs(value), duration))
+
+    model = SpeedModel()
+    for kind in ("turn", "move"):
+        if len(samples[kind]) < 2:
+            continue
+        seconds_per_unit, latency = fit_linear(samples[kind])
+        if seconds_per_unit > 0:
+            setattr(model, f"{kind}_latency", max(latency, 0.0))
+            setattr(model, f"{kind}_speed", 1.0 / seconds_per_unit)
+    return model
+
+def load_trace_records(file_path):
+    with open(file_path) as f:
+        return json.load(f)["records"]
+
+
+# --- plan 통계 ---
+# plan을 한 번 훑는 계산이라 numpy 배열로 바꾸는 비용이 더 커서 순수 파이썬으로 계산함
+# (캐시된 plan을 실행하기 전에 출력할 때 numpy를 불러오지 않아도 됨)
+def plan_stats(plan, model=None):
+    # 그리기(draw)와 transit으로 나눈 명령 수, 거리(cm), 회전(도), 예상 시간(s)
+    model = model or SpeedModel()
+    stats = {name: {"turns": 0, "moves": 0, "arcs": 0, "backward": 0, "distance": 0.0, "rotation": 0.0,
+                    "estimated_time": 0.0} for name in ("draw", "transit")}
+    paths = 0
+    depth = 0
+    part = stats["transit"]
+    for op, value in plan:
+        if op == "turn":
+            part["turns"] += 1
+            part["rotation"] += abs(value)
+            part["estimated_time"] += model.turn_latency + abs(value) / model.turn_speed
+        elif op == "forward":
+            part["moves"] += 1
+            part["backward"] += value < 0
+            part["distance"] += abs(value)
+            part["estimated_time"] += model.move_latency + abs(value) / model.move_speed
+        elif op == "arc":
+            sweep, radius = value
+            distance = math.radians(abs(sweep)) * radius
+            part["arcs"] += 1
+            part["distance"] += distance
+            part["estimated_time"] += model.move_latency + distance / model.move_speed
+        elif op == "path_start":
+            # path_start 이후 path_end 전까지가 그리는 구간, 나머지는 transit
+            paths += 1
+            depth += 1
+            part = stats["draw"]
+        elif op == "path_end":
+            depth -= 1
+            part = stats["draw"] if depth > 0 else stats["transit"]
+
+    stats["commands"] = sum(part["turns"] + part["moves"] + part["arcs"] for part in (stats["draw"], stats["transit"]))
+    stats["paths"] = paths
+    stats["estimated_time"] = stats["draw"]["estimated_time"] + stats["transit"]["estimated_time"]
+    return stats
+
+
+# --- dry run ---
+def dry_run(parsed_paths, model=None, order=True, unit="px", paper_size=None, **params):
+    # execute_path / cached_plan과 같은 단계로 plan을 만들고 로봇 없이 통계만 반환
+    # parsed_paths: parse_svg() 결과 또는 SVG 파일 경로, params: compile_plan()의 인자
+    from svg_parser import parse_svg
+    from path_planner import order_paths
+    from motion_plan import compile_plan
+
+    if isinstance(parsed_paths, str):
+        parsed_paths = parse_svg(parsed_paths, unit, paper_size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if order:
+            parsed_paths, _ = order_paths(parsed_paths)
+        plan = compile_plan(parsed_paths, **params)
+    return plan, plan_stats(plan, model)
+
+def choose_parameters(parsed_paths, grid, model=None, accept=None, **fixed):
+    # grid: {"파라미터": [후보, ...]} (order, scale, steps_bezier, tolerance, reverse 등)
+    # accept(params, stats) → bool: 허용되는 결과인지 (예: 근사 허용 오차 제한), 없으면 모두 허용
+    # 반환: (가장 빠른 params, 전체 결과 [(params, stats), ...] 예상 시간 순)
+    from svg_parser import parse_svg
+    if isinstance(parsed_paths, str):
+        parsed_paths = parse_svg(parsed_paths)
+
+    names = list(grid)
+    results = []
+    for combination in itertools.product(*(grid[name] for name in names)):
+        params = {**fixed, **dict(zip(names, combination))}
+        _, stats = dry_run(parsed_paths, model, **params)
+        if accept is None or accept(params, stats):
+            results.append((params, stats))
+    results.sort(key=lambda result: result[1]["estimated_time"])
+    return (results[0][0] if results else None), results
+
+
+def format_time(seconds):
+    minutes, seconds = divmod(int(math.ceil(seconds)), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+def print_stats(stats):
+    print(f"Estimated time: {format_time(stats['estimated_time'])} ({stats['commands']} commands, {stats['paths']} paths)")
+    for name in ("draw", "transit"):
+        part = stats[name]
+        print(f"  {name:8s}{part['distance']:8.1f} cm {part['rotation']:8.0f} deg "
+              f"{part['turns'] + part['moves'] + part['arcs']:6d} commands  {format_time(part['estimated_time'])}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="로봇 없이 그리기 소요 시간 예상")
+    parser.add_argument("svg", nargs="?", default="Mouse.svg")
+    parser.add_argument("--fit", help="instrument.py의 save_json()으로 저장한 실행 기록으로 속도 모델 맞추기")
+    parser.add_argument("--max-tolerance", type=float, default=0.1, help="허용하는 최대 근사 오차 (cm)")
+    args = parser.parse_args()
+
+    model = fit_speed_model(load_trace_records(args.fit)) if args.fit else SpeedModel()
+    print(f"Speed model: {model.to_dict()}")
+
+    grid = {
+        "order": [False, True],
+        "tolerance": [0.02, 0.05, 0.1, 0.2],
+        "arc_tolerance": [None, 0.05],
+        "simplify_tolerance": [None, 0.03],
+        "reverse": [False, True],
+    }
+    # 근사 오차와 단순화 오차의 합이 max_tolerance 이하인 조합만 허용
+    accept = lambda params, stats: params["tolerance"] + (params["simplify_tolerance"] or 0) <= args.max_tolerance
+    best, results = choose_parameters(args.svg, grid, model, accept)
+    for params, stats in results[:5]:
+        print(f"{format_time(stats['estimated_time']):>8s}  {params}")
+    print(f"Best: {best}")
+    print_stats(results[0][1])
@@ -0,0 +1,133 @@
+# flatten.py
+# parse_svg() 결과 전체를 한 번에 직선(polyline)으로 근사하는 NumPy 벡터화 모듈
+import numpy as np
+from segments import SegmentStore, SEG_LINE, SEG_QUAD, SEG_CUBIC, SEG_ARC, SEG_CIRCLE, SEG_CLOSE
+
+
+# --- Bernstein 기저 행렬 (분할 수별로 캐시) ---
+_basis_cache = {}
+
+def bernstein_basis(degree, n):
+    # t = 1/n ... 1 (시작점 제외)에서의 기저값, shape (n, degree+1)
+    key = (degree, n)
+    if key not in _basis_cache:
+        t = np.arange(1, n + 1) / n
+        s = 1 - t
+        if degree == 2:
+            basis = np.stack([s**2, 2*s*t, t**2], axis=1)
+        else:
+            basis = np.stack([s**3, 3*s**2*t, 3*s*t**2, t**3], axis=1)
+        _basis_cache[key] = basis
+    return _basis_cache[key]
+
+
+# --- 세그먼트별 분할 수 ---
+def _bezier_steps(ctrl, degree, tolerance):
+    # Wang 공식: 2차 차분의 최대 크기 M에 대해 n = ceil(sqrt(d(d-1)/8 * M / tol))
+    if degree == 2:
+        dd = np.linalg.norm(ctrl[:, 0] - 2*ctrl[:, 1] + ctrl[:, 2], axis=1)
+    else:
+        dd = np.maximum(np.linalg.norm(ctrl[:, 0] - 2*ctrl[:, 1] + ctrl[:, 2], axis=1),
+                        np.linalg.norm(ctrl[:, 1] - 2*ctrl[:, 2] + ctrl[:, 3], axis=1))
+    n = np.ceil(np.sqrt(degree * (degree - 1) / 8 * dd / tolerance))
+    return np.maximum(n, 1).astype(np.int64)
+
+def _arc_steps(radius, sweep, tolerance, min_steps):
+    # 현 오차 r(1 - cos(θ/2)) <= tol 이 되도록 각도 간격 θ 결정
+    ratio = np.clip(1 - tolerance / np.maximum(radius, 1e-12), -1, 1)
+    step = 2 * np.degrees(np.arccos(ratio))
+    n = np.ceil(np.abs(sweep) / np.maximum(step, 1e-12))
+    n = np.where(radius <= tolerance, min_steps, n)
+    return np.maximum(n, min_steps).astype(np.int64)
+
+def _arc_angles(kinds, ctrl):
+    # 시작각에서 끝각까지, radius가 양수면 각도가 증가하는 방향(sweep-flag=1), 음수면 감소하는 방향으로 그림
+    center = ctrl[:, 2]
+    start_angle = np.degrees(np.arctan2(ctrl[:, 0, 1] - center[:, 1], ctrl[:, 0, 0] - center[:, 0]))
+    end_angle = np.degrees(np.arctan2(ctrl[:, 1, 1] - center[:, 1], ctrl[:, 1, 0] - center[:, 0]))
+    increasing = ctrl[:, 3, 0] > 0
+    end_angle = np.where(increasing & (end_angle < start_angle), end_angle + 360, end_angle)
+    end_angle = np.where(~increasing & (end_angle > start_angle), end_angle - 360, end_angle)
+
+    is_circle = kinds == SEG_CIRCLE
+    start_angle = np.where(is_circle, 0.0, start_angle)
+    end_angle = np.where(is_circle, 360.0, end_angle)
+    return start_angle, end_angle
+
+
+# --- 평탄화 ---
+def flatten_segments(kinds, ctrl, path_offsets, starts, tolerance=None, steps_bezier=10, steps_arc=10):
+    # tolerance: SVG 단위 현 오차, None이면 고정 분할 (steps_bezier / steps_arc)
+    kinds = np.asarray(kinds)
+    ctrl = np.asarray(ctrl, dtype=np.float64).reshape(-1, 4, 2)
+    n_segments = len(kinds)
+
+    # 1) 세그먼트별 출력 점 개수 (시작점 제외)
+    counts = np.ones(n_segments, dtype=np.int64)
+    is_quad = kinds == SEG_QUAD
+    is_cubic = kinds == SEG_CUBIC
+    is_arc = (kinds == SEG_ARC) | (kinds == SEG_CIRCLE)
+    start_angle, end_angle = _arc_angles(kinds[is_arc], ctrl[is_arc])
+
+    if tolerance is None:
+        counts[is_quad | is_cubic] = steps_bezier
+        counts[is_arc] = max(steps_arc - 1, 1)
+    else:
+        counts[is_quad] = _bezier_steps(ctrl[is_quad], 2, tolerance)
+        counts[is_cubic] = _bezier_steps(ctrl[is_cubic], 3, tolerance)
+        radius = np.abs(ctrl[is_arc, 3]).max(axis=1)
+        min_steps = np.where(kinds[is_arc] == SEG_CIRCLE, 3, 1)
+        counts[is_arc] = _arc_steps(radius, end_angle - start_angle, tolerance, min_steps)
+
+    # 2) 출력 배열 위치: path마다 시작점 1개 + 세그먼트 점들
+    path_offsets = np.asarray(path_offsets, dtype=np.int64)
+    n_paths = len(path_offsets) - 1
+    seg_path = np.repeat(np.arange(n_paths), np.diff(path_offsets))
+    cum = np.concatenate(([0], np.cumsum(counts)))
+    seg_out = cum[:-1] + seg_path + 1
+    out_offsets = np.zeros(n_paths + 1, dtype=np.int64)
+    out_offsets[1:] = np.cumsum(np.diff(cum[path_offsets]) + 1)
+
+    points = np.empty((out_offsets[-1], 2), dtype=np.float64)
+    points[out_offsets[:-1]] = starts
+
+    # 3) 직선(L, Z): 끝점 하나
+    is_line = (kinds == SEG_LINE) | (kinds == SEG_CLOSE)
+    points[seg_out[is_line]] = ctrl[is_line, 1]
+
+    # 4) 베지어: 분할 수가 같은 세그먼트끼리 기저 행렬 한 번으로 계산
+    for mask, degree in ((is_quad, 2), (is_cubic, 3)):
+        indices = np.nonzero(mask)[0]
+        for n in np.unique(counts[indices]):
+            group = indices[counts[indices] == n]
+            basis = bernstein_basis(degree, int(n))
+            curve = np.einsum('tk,skd->std', basis, ctrl[group, :degree+1])
+            points[(seg_out[group][:, None] + np.arange(n)).ravel()] = curve.reshape(-1, 2)
+
+    # 5) 원호/원: 분할 수가 같은 세그먼트끼리 cos/sin을 한 번에 계산
+    indices = np.nonzero(is_arc)[0]
+    arc_counts = counts[indices]
+    for n in np.unique(arc_counts):
+        local = np.nonzero(arc_counts == n)[0]
+        group = indices[local]
+        frac = np.arange(1, n + 1) / n
+        angles = np.radians(start_angle[local, None] + (end_angle - start_angle)[local, None] * frac)
+        center = ctrl[group, 2]
+        radius = np.abs(ctrl[group, 3])
+        curve = np.stack([center[:, 0, None] + radius[:, 0, None] * np.cos(angles),
+                          center[:, 1, None] + radius[:, 1, None] * np.sin(angles)], axis=-1)
+        points[(seg_out[group][:, None] + np.arange(n)).ravel()] = curve.reshape(-1, 2)
+
+    return points, out_offsets
+
+def flatten_paths(parsed_paths, tolerance=None, steps_bezier=10, steps_arc=10):
+    # 결과: 모든 path의 점을 이어 붙인 (N, 2) 배열과 path 경계 offsets (P+1,)
+    # i번째 path의 polyline = points[offsets[i]:offsets[i+1]]
+    # parse_svg()의 SegmentStore는 배열을 그대로 쓰고, dict 형식은 한 번 변환
+    store = SegmentStore.from_paths(parsed_paths)
+    return flatten_segments(store.kinds, store.ctrl, store.path_offsets, store.starts,
+                            tolerance, steps_bezier, steps_arc)
+
+def iter_polylines(points, offsets):
+    for i in range(len(offsets) - 1):
+        yield points[offsets[i]:offsets[i+1]]
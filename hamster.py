@@ -1,10 +1,44 @@
 # hamster.py (수정)
-from roboid import * 
-from svg_parser import parse_svg 
-from utils import execute_path 
+# 여기서 불러오는 모듈은 모두 가벼움: svgpathtools/numpy는 cached_plan()이 SVG를 새로 컴파일할 때만 불러오고,
+# roboid는 create_robot("roboid")에서 불러옴 (캐시된 plan 실행은 로봇 백엔드만 불러옴)
+from robots import create_robot
+from plan_cache import cached_plan
+from pose import PoseExecutor, load_calibration
+from checkpoint import Checkpoint, resume_plan
+from instrument import TracedRobot, print_summary
+from estimate import SpeedModel, plan_stats, print_stats
 
-# Hamster 객체 생성
-h = Turtle()
+# 로봇 백엔드: "roboid"(실제 Turtle) 또는 "sim"(하드웨어 없이 시뮬레이션)
+ROBOT_BACKEND = "roboid"
+
+# 보정값을 불러올 로봇 이름 (calibration.json, `python pose.py roboid <이름>`으로 생성)
+ROBOT_NAME = "default"
+
+# 명령별 시간 기록을 저장할 파일 (None이면 기록 안 함), chrome://tracing에서 열 수 있음
+TRACE_FILE = None
+
+# True면 로봇 없이 예상 소요 시간/명령 수만 출력하고 끝냄
+DRY_RUN = False
+
+# 실행 중 진행 상황(명령 번호, path 번호, 추정 위치)을 저장할 파일 (None이면 저장 안 함), 끝까지 그리면 삭제됨
+CHECKPOINT_FILE = "checkpoint.json"
+
+# True면 CHECKPOINT_FILE에 저장된 지점부터 이어서 그림 (저장된 것이 없으면 처음부터)
+RESUME = False
+
+# 이어서 그릴 때 로봇의 현재 위치 (x, y cm, 방향 도)
+# None이면 멈춘 자리에 그대로 있다고 보고, 처음 위치에 다시 놓았다면 (0, 0, motion_model.heading_offset)
+RESUME_POSE = None
+
+# 예상 시간 계산용 속도 모델 (`python estimate.py --fit <기록.json>`으로 맞춘 값을 넣을 수 있음)
+speed_model = SpeedModel()
+
+# Hamster 객체 생성 (DRY_RUN이면 로봇에 연결하지 않음)
+robot = None if DRY_RUN else create_robot(ROBOT_BACKEND)
+h = robot
+if TRACE_FILE and robot is not None:
+    # 시뮬레이션이면 실제 시간 대신 시뮬레이션 시간으로 기록
+    h = TracedRobot(robot, clock=(lambda: robot.elapsed) if ROBOT_BACKEND == "sim" else None)
 
 # 로봇의 초기 위치와 각도 설정 (0, 0, 0)
 current_position = (0, 0)
@@ -13,11 +47,47 @@ current_angle = 0
 # 파싱할 SVG 파일 경로
 svg_file_path = "Mouse.svg" 
 
-#   오차 보정 값 설정
-ANGLE_OFFSET = 1.05
+# 종이 크기 (가로, 세로 cm), 예: A4 가로 (29.7, 21.0)
+# 지정하면 그림을 cm 단위로 읽어 종이 여백 안에 맞추므로 scale은 1이 됨 (None이면 SVG 좌표 × 0.07)
+PAPER_SIZE = None
+
+#   오차 보정 모델 (회전/이동 gain, bias, 처음 방향) 불러오기
+motion_model = load_calibration(robot_name=ROBOT_NAME)
+
+# SVG 파싱 → path 순서 최적화 → 명령 목록 컴파일
+# (같은 SVG와 설정으로 이미 컴파일한 적이 있으면 .plan_cache에서 바로 불러옴)
+# arc_tolerance: 원/원호/원에 가까운 곡선을 arc 명령 하나로 묶을 때의 허용 오차 (cm)
+# simplify_tolerance: 거의 한 직선 위에 있는 점을 지울 때의 허용 오차 (cm)
+# reverse: 회전이 줄어들면 후진으로 그림 (펜이 로봇 가운데에 있으므로 같은 선이 그려짐)
+#   전진만 쓴 plan과 같은 선을 그리는지는 benchmark.py가 검사함 (아래 sim 위치 오차는 plan 기준이라 plan 자체의 오류는 못 잡음)
+if PAPER_SIZE:
+    plan = cached_plan(svg_file_path, unit="cm", paper_size=PAPER_SIZE, scale=1.0, steps_bezier=10, steps_arc=10,
+                       tolerance=0.1, arc_tolerance=0.05, simplify_tolerance=0.03, reverse=True)
+else:
+    plan = cached_plan(svg_file_path, scale=0.07, steps_bezier=10, steps_arc=10,
+                       tolerance=0.1, arc_tolerance=0.05, simplify_tolerance=0.03, reverse=True)
+
+# 실행 전에 예상 소요 시간, 그리기/transit 거리와 회전 출력
+print_stats(plan_stats(plan, speed_model))
+
+if not DRY_RUN:
+    #   추정 위치에서 매 이동을 다시 계산하며 로봇 실행
+    # 블루투스 끊김/배터리 부족으로 멈추면 RESUME = True로 다시 실행해 이어서 그림 (plan은 캐시에서 불러옴)
+    executor = PoseExecutor(h, motion_model)
+    checkpoint = Checkpoint(CHECKPOINT_FILE, plan) if CHECKPOINT_FILE else None
+    if ROBOT_BACKEND == "sim":
+        # 보정 모델이 명령값을 미리 바꾸므로 위치 오차는 로봇이 받은 명령이 아니라 plan 기준으로 잼
+        robot.reference = lambda: executor.ideal[:2]
+    if RESUME and checkpoint:
+        resume_plan(executor, plan, checkpoint, RESUME_POSE)
+    else:
+        executor.run(plan, checkpoint=checkpoint)
 
-# 파싱된 SVG 경로 데이터 가져오기
-parsed_paths = parse_svg(svg_file_path) 
+    # 시뮬레이션이면 예상 소요 시간/명령 수/plan 대비 위치 오차 출력
+    if ROBOT_BACKEND == "sim":
+        print(robot.summary())
 
-#   경로를 따라 로봇이 움직이도록 실행 (offset 인자 전달)
-execute_path(h, parsed_paths, angle_offset=ANGLE_OFFSET)
\ No newline at end of file
+    # 회전 / 이동 / transit에 쓴 시간 출력 및 trace 저장
+    if TRACE_FILE:
+        print_summary(h.trace.summary())
+        h.trace.save_chrome_trace(TRACE_FILE)
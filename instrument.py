@@ -0,0 +1,146 @@
+# instrument.py
+# 로봇 명령마다 시작 시각, 종류, 값, 걸린 시간을 기록하는 계측 모듈
+#   h = TracedRobot(create_robot("roboid"))  → 그대로 execute_path / run_commands / PoseExecutor에 넘김
+#   h.trace.summary()                        → 회전 / 이동 / transit에 쓴 시간, path별 시간
+#   h.trace.save_chrome_trace("trace.json")  → chrome://tracing 또는 ui.perfetto.dev에서 열기
+import json
+import time
+
+# 계측할 로봇 명령과 분류 (path 밖에서 실행된 명령은 모두 'transit')
+MOTION_OPS = {
+    "turn_left": "turn", "turn_right": "turn",
+    "move_forward": "move", "move_backward": "move",
+    "swing_left": "move", "swing_right": "move",
+}
+
+
+class CommandTrace:
+    # 최근 capacity개 명령만 고정 크기 ring buffer에 보관하고, 합계는 버려진 명령까지 포함해 따로 누적함
+    def __init__(self, capacity=65536, clock=None):
+        self.capacity = capacity
+        self.clock = clock or time.perf_counter
+        self.records = [None] * capacity
+        self.count = 0
+        self.origin = self.clock()
+        self.path = None
+        self.path_spans = {}
+        self.time_by_category = {"turn": 0.0, "move": 0.0, "transit": 0.0}
+        self.time_by_op = {}
+        self.time_by_path = {}
+
+    def record(self, op, value, start, duration):
+        category = "transit" if self.path is None else MOTION_OPS[op]
+        # (시작 시각, 걸린 시간, 명령, 값, path 번호, 분류)
+        self.records[self.count % self.capacity] = (start - self.origin, duration, op, value, self.path, category)
+        self.count += 1
+        self.time_by_category[category] += duration
+        self.time_by_op[op] = self.time_by_op.get(op, 0.0) + duration
+        if self.path is not None:
+            self.time_by_path[self.path] = self.time_by_path.get(self.path, 0.0) + duration
+
+    def path_started(self, index):
+        self.path = index
+        self.path_spans[index] = [self.clock() - self.origin, None]
+
+    def path_ended(self, index):
+        if index in self.path_spans:
+            self.path_spans[index][1] = self.clock() - self.origin
+        self.path = None
+
+    # --- 결과 ---
+    def iter_records(self):
+        # 오래된 것부터 (ring buffer가 한 바퀴 돌았으면 남아 있는 것만)
+        first = max(0, self.count - self.capacity)
+        for i in range(first, self.count):
+            yield self.records[i % self.capacity]
+
+    def summary(self):
+        total = sum(self.time_by_category.values())
+        return {
+            "commands": self.count,
+            "dropped": max(0, self.count - self.capacity),
+            "total": total,
+            **self.time_by_category,
+            "share": {k: (v / total if total else 0.0) for k, v in self.time_by_category.items()},
+            "by_op": dict(self.time_by_op),
+            "paths": dict(self.time_by_path),
+        }
+
+    def to_chrome_trace(self):
+        # Chrome trace event 형식: 명령은 tid 1, path 구간은 tid 2 (시간 단위 µs)
+        events = [{"name": op, "cat": category, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6,
+                   "pid": 1, "tid": 1, "args": {"value": value, "path": path}}
+                  for start, duration, op, value, path, category in self.iter_records()]
+        for index, (start, end) in self.path_spans.items():
+            if end is not None:
+                events.append({"name": f"Path {index+1}", "cat": "path", "ph": "X", "ts": start * 1e6,
+                               "dur": (end - start) * 1e6, "pid": 1, "tid": 2})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def save_json(self, file_path):
+        keys = ("start", "duration", "op", "value", "path", "category")
+        with open(file_path, "w") as f:
+            json.dump({"summary": self.summary(),
+                       "records": [dict(zip(keys, record)) for record in self.iter_records()]}, f, indent=2)
+
+
+class TracedRobot:
+    # 로봇 객체를 감싸서 명령 호출만 가로채 기록하고 나머지 속성은 그대로 넘김
+    # 감싼 로봇에 없는 명령(예: swing_left)은 여기에도 없으므로 기능 확인(hasattr)이 그대로 동작함
+    def __init__(self, h, capacity=65536, clock=None):
+        self.h = h
+        self.trace = CommandTrace(capacity, clock)
+
+    def __getattr__(self, name):
+        attr = getattr(self.h, name)
+        if name not in MOTION_OPS:
+            return attr
+        trace = self.trace
+        clock = trace.clock
+
+        def traced(*args, **kwargs):
+            start = clock()
+            result = attr(*args, **kwargs)
+            trace.record(name, args[0] if args else None, start, clock() - start)
+            return result
+        return traced
+
+    # run_command()가 path_start / path_end 명령에서 호출
+    def path_started(self, index):
+        self.trace.path_started(index)
+
+    def path_ended(self, index):
+        self.trace.path_ended(index)
+
+
+def print_summary(summary):
+    print(f"Commands: {summary['commands']} ({summary['dropped']} dropped from trace buffer)")
+    for category in ("turn", "move", "transit"):
+        print(f"  {category:8s}{summary[category]:10.2f} s  {summary['share'][category]*100:5.1f}%")
+    slowest = sorted(summary["paths"].items(), key=lambda item: item[1], reverse=True)[:5]
+    for index, seconds in slowest:
+        print(f"  Path {index+1}: {seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    # 실행: python instrument.py [SVG 파일] [trace 파일] — 시뮬레이션 로봇으로 그리며 시뮬레이션 시간 기준으로 기록
+    import io
+    import sys
+    import contextlib
+    from svg_parser import parse_svg
+    from robots import SimulatedTurtle
+    from motion_plan import compile_plan, run_commands
+
+    svg_file_path = sys.argv[1] if len(sys.argv) > 1 else "Mouse.svg"
+    trace_file_path = sys.argv[2] if len(sys.argv) > 2 else "trace.json"
+    sim = SimulatedTurtle()
+    h = TracedRobot(sim, clock=lambda: sim.elapsed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_commands(h, compile_plan(parse_svg(svg_file_path), arc_tolerance=0.05))
+    print_summary(h.trace.summary())
+    h.trace.save_chrome_trace(trace_file_path)
+    print(f"Chrome trace written to {trace_file_path}")
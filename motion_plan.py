@@ -0,0 +1,335 @@
+# motion_plan.py
+# polyline을 로봇 명령 목록으로 바꾸고, 불필요한 명령을 줄이는 모듈
+#   ('turn', 각도)        : 양수면 turn_right, 음수(또는 0)면 turn_left
+#   ('forward', 거리)     : move_forward (로봇 단위), 음수면 move_backward
+#   ('arc', (각도, 반지름)) : 반지름(로봇 단위)인 원을 따라 각도만큼 방향을 바꾸며 이동 (양수면 오른쪽)
+#   ('path_start', i) / ('path_end', i) : path 경계 표시 (펜 내림/올림 위치, 로봇 동작 없음)
+# 근사/단순화/원호 모듈(numpy)은 컴파일할 때만 불러옴
+# (캐시된 plan을 실행만 할 때는 run_command만 쓰므로 numpy를 불러오지 않음)
+import math
+
+# swing 명령이 없는 로봇에서 arc를 현(chord)으로 나눌 때의 허용 오차 (로봇 단위)
+ARC_FALLBACK_TOLERANCE = 0.05
+
+
+# --- 한 번의 이동 계산 (utils.move_to와 같은 계산) ---
+def plan_move(start, end, current_angle, scale=0.07, angle_offset=0):
+    distance = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2) * scale
+    target_angle = math.degrees(math.atan2(-(end[1]-start[1]), end[0]-start[0]))
+
+    target_angle += angle_offset
+
+    angle_diff = target_angle - current_angle
+    if angle_diff > 180:
+        angle_diff -= 360
+    elif angle_diff < -180:
+        angle_diff += 360
+
+    return angle_diff, distance, target_angle
+
+
+# --- 후진 선택 (회전 최소화) ---
+def _line_heading(start, end, angle_offset=0):
+    if start[0] == end[0] and start[1] == end[1]:
+        return None
+    return math.degrees(math.atan2(-(end[1]-start[1]), end[0]-start[0])) + angle_offset
+
+def choose_directions(moves, current_angle):
+    # moves: (들어갈 때 방향, 나올 때 방향, 후진 가능 여부) 목록, 방향이 None이면 길이 0인 이동
+    # 각 이동을 전진/후진(몸체 방향 + 180도) 중 무엇으로 할지 정해 회전 각도 합이 가장 작은 조합을 반환 (DP)
+    # 상태: 직전 이동을 마친 뒤의 몸체 방향 (이동마다 전진/후진 2개)
+    states = [(current_angle, 0.0)]
+    back_pointers = []
+    for entry, exit_, reversible in moves:
+        if entry is None:
+            # 길이 0: 회전 없이 그대로 지나감
+            back_pointers.append([(k, False) for k in range(len(states))])
+            continue
+        row, pointers = [], []
+        for backward in ((False, True) if reversible else (False,)):
+            flip = 180 if backward else 0
+            # 비용이 같으면 전진을 고르도록 후진에 아주 작은 값을 더함
+            costs = [cost + abs(_normalize(entry + flip - heading)) + (1e-9 if backward else 0.0)
+                     for heading, cost in states]
+            k = min(range(len(states)), key=costs.__getitem__)
+            row.append((exit_ + flip, costs[k]))
+            pointers.append((k, backward))
+        states = row
+        back_pointers.append(pointers)
+
+    # 가장 싼 마지막 상태에서 거꾸로 따라가며 선택을 복원
+    k = min(range(len(states)), key=lambda i: states[i][1])
+    directions = []
+    for pointers in reversed(back_pointers):
+        k, backward = pointers[k]
+        directions.append(backward)
+    return directions[::-1]
+
+def _line_move(start, end, current_angle, scale, angle_offset, backward):
+    turn, distance, target_angle = plan_move(start, end, current_angle, scale, angle_offset)
+    if not backward:
+        return turn, distance, target_angle
+    # 후진: 몸체는 진행 방향의 반대를 보고 뒤로 이동
+    target_angle = _normalize(target_angle + 180)
+    return _normalize(target_angle - current_angle), -distance, target_angle
+
+
+# --- polyline → 명령 목록 ---
+def iter_polyline_commands(polylines, scale=0.07, angle_offset=0, arc_tolerance=None, reverse=False):
+    # polylines는 리스트뿐 아니라 하나씩 만들어지는 iterator여도 됨
+    # arc_tolerance(로봇 단위)를 주면 원 위의 연속된 점들을 arc 명령 하나로 묶음
+    # reverse=True면 path마다(시작점으로의 transit 포함) 회전 합이 가장 작도록 후진을 섞어서 이동
+    if arc_tolerance is not None:
+        from arcs import fit_arcs, arc_geometry
+    current_position = None
+    current_angle = 0
+
+    for path_index, polyline in enumerate(polylines):
+        # path 시작점으로 이동 (첫 path이거나 현재 위치와 같으면 생략)
+        transit = current_position is not None and current_position != polyline[0]
+        if arc_tolerance is None:
+            pieces = [('line', i-1, i) for i in range(1, len(polyline))]
+        else:
+            pieces = fit_arcs(polyline, arc_tolerance / scale)
+
+        # 원호는 swing으로 전진만 하고, 직선은 전진/후진 중 선택
+        arcs = {}
+        if reverse:
+            moves = []
+            if transit:
+                heading = _line_heading(current_position, polyline[0], angle_offset)
+                moves.append((heading, heading, True))
+            for n, piece in enumerate(pieces):
+                if piece[0] == 'line':
+                    heading = _line_heading(polyline[piece[1]], polyline[piece[2]], angle_offset)
+                    moves.append((heading, heading, True))
+                else:
+                    _, i, j, center, radius = piece
+                    arcs[n] = arc_geometry(polyline[i:j+1], radius)
+                    start_heading = arcs[n][0] + angle_offset
+                    moves.append((start_heading, start_heading + arcs[n][1], False))
+            backward = choose_directions(moves, current_angle)
+        else:
+            backward = [False] * (len(pieces) + transit)
+
+        if transit:
+            turn, distance, current_angle = _line_move(current_position, polyline[0], current_angle,
+                                                       scale, angle_offset, backward[0])
+            yield ('turn', turn)
+            yield ('forward', distance)
+
+        yield ('path_start', path_index)
+        for n, (piece, back) in enumerate(zip(pieces, backward[transit:])):
+            if piece[0] == 'line':
+                _, i, j = piece
+                turn, distance, current_angle = _line_move(polyline[i], polyline[j], current_angle,
+                                                           scale, angle_offset, back)
+                yield ('turn', turn)
+                yield ('forward', distance)
+            else:
+                _, i, j, center, radius = piece
+                start_heading, sweep, radius = arcs[n] if n in arcs else arc_geometry(polyline[i:j+1], radius)
+                start_heading += angle_offset
+                yield ('turn', _normalize(start_heading - current_angle))
+                yield ('arc', (sweep, radius * scale))
+                current_angle = start_heading + sweep
+        yield ('path_end', path_index)
+        current_position = polyline[-1]
+
+def polyline_commands(polylines, scale=0.07, angle_offset=0, arc_tolerance=None, reverse=False):
+    return list(iter_polyline_commands(polylines, scale, angle_offset, arc_tolerance, reverse))
+
+
+# --- 명령 합치기 ---
+def _normalize(angle):
+    angle = (angle + 180) % 360 - 180
+    return 180.0 if angle == -180 else angle
+
+def _flush_run(run):
+    # 합친 이동(run)을 회전 + 이동 명령으로 바꿈: 첫 전진 방향이 아니라 실제 끝점을 향하도록 다시 계산
+    # run: [run 앞의 회전, run 시작 방향 기준 plan 방향, dx, dy, 전진 여부] (dx는 시작 방향, dy는 오른쪽)
+    #   후진 run도 (dx, dy)는 로봇이 바라보는 방향 기준으로 쌓으므로 회전은 같고 거리의 부호만 다름
+    # 반환: (명령 목록, 끝난 뒤 plan 방향 - 로봇 방향) — 남은 방향 차이는 다음 회전에 더함
+    turn, heading, dx, dy, forward = run
+    direction = math.degrees(math.atan2(dy, dx))
+    distance = math.hypot(dx, dy)
+    turn = _normalize(turn + direction)
+    commands = []
+    if abs(turn) > 1e-9:
+        # min_angle보다 작아도 생략하면 run 전체가 비껴가므로 그대로 내보냄
+        commands.append(('turn', turn))
+        turn = 0.0
+    commands.append(('forward', distance if forward else -distance))
+    return commands, heading - direction + turn
+
+def iter_coalesce(commands, min_distance=0.01, min_angle=0.1):
+    # 1) 연속된 회전은 하나로 합침
+    # 2) min_distance 미만 이동은 앞의 이동에 합치고, 합칠 이동이 없으면 버림
+    # 3) min_angle 미만 회전은 생략하고 앞뒤 전진을 하나로 합침 (한 직선 위의 점들)
+    #    합친 이동은 실제 끝점을 향하도록 회전/거리를 다시 계산하고, 끝점에서의 방향 차이는 다음 회전에 더해서
+    #    생략한 각도 때문에 위치나 방향 오차가 누적되지 않게 함
+    #    전진과 후진은 같은 선을 되짚어 그리는 것이므로 합치지 않음
+    # 이동은 다음 전진과 합쳐질 수 있으므로 다른 명령이 올 때까지 내보내지 않고 들고 있음
+    pending_turn = 0.0
+    run = None
+
+    for command in commands:
+        op, value = command
+        if op == 'turn':
+            pending_turn += value
+            continue
+
+        if op != 'forward':
+            if run is not None:
+                flushed, residual = _flush_run(run)
+                yield from flushed
+                pending_turn += residual
+                run = None
+            if op == 'arc':
+                # arc는 시작 방향이 중요하므로 쌓인 회전을 먼저 내보냄
+                turn = _normalize(pending_turn)
+                if abs(turn) > 1e-9:
+                    yield ('turn', turn)
+                pending_turn = 0.0
+            yield command
+            continue
+
+        if run is None:
+            if abs(value) < min_distance:
+                continue
+            run = [pending_turn, 0.0, abs(value), 0.0, value > 0]
+            pending_turn = 0.0
+            continue
+
+        heading = _normalize(run[1] + pending_turn)
+        if abs(value) < min_distance or (abs(heading) < min_angle and (value > 0) == run[4]):
+            # 같은 직선 위의 이동(또는 아주 짧은 이동)은 run에 더함
+            rad = math.radians(heading)
+            run[1] = heading
+            run[2] += value * math.cos(rad) * (1 if run[4] else -1)
+            run[3] += value * math.sin(rad) * (1 if run[4] else -1)
+            pending_turn = 0.0
+        else:
+            flushed, residual = _flush_run(run)
+            yield from flushed
+            run = [_normalize(residual + pending_turn), 0.0, abs(value), 0.0, value > 0]
+            pending_turn = 0.0
+
+    if run is not None:
+        yield from _flush_run(run)[0]
+
+def coalesce_commands(commands, min_distance=0.01, min_angle=0.1):
+    return list(iter_coalesce(commands, min_distance, min_angle))
+
+def count_motion(commands):
+    return sum(1 for op, _ in commands if op in ('turn', 'forward', 'arc'))
+
+
+# --- 컴파일: parse_svg() 결과 → 최적화된 명령 목록 ---
+def flatten_tolerance(tolerance, arc_tolerance=None):
+    # 곡선 근사 허용 오차(로봇 단위)
+    # arc 명령을 쓰면 현과 원호 사이 거리가 arc_tolerance/2 이내인 점들만 원호로 묶이므로 곡선을 그만큼 잘게 나눔
+    # (직선은 영향 없고, 원호로 묶이지 않은 곡선의 점은 simplify 단계에서 다시 줄어듦)
+    if tolerance is None or arc_tolerance is None:
+        return tolerance
+    return min(tolerance, arc_tolerance / 2)
+
+def compile_plan(parsed_paths, scale=0.07, steps_bezier=10, steps_arc=10, angle_offset=0, tolerance=0.1,
+                 min_distance=0.01, min_angle=0.1, arc_tolerance=None, simplify_tolerance=None, reverse=False):
+    # tolerance: 곡선 근사 허용 오차(로봇 단위), None이면 steps_bezier/steps_arc 고정 분할 사용
+    #   arc_tolerance를 주면 곡선은 flatten_tolerance()만큼 더 잘게 나눔
+    # min_distance / min_angle: 이보다 작은 이동/회전은 생략하고 한 직선 위의 이동은 합침
+    # arc_tolerance: 원 위의 점들을 arc 명령으로 묶을 때의 허용 오차(로봇 단위), None이면 사용 안 함
+    # simplify_tolerance: 거의 한 직선 위에 있는 점을 지울 때의 허용 오차(로봇 단위), None이면 사용 안 함
+    # reverse: 회전이 줄어드는 경우 후진으로 이동
+    from flatten import flatten_paths, iter_polylines
+    from simplify import simplify_polylines
+    tolerance = flatten_tolerance(tolerance, arc_tolerance)
+    svg_tolerance = tolerance / scale if tolerance is not None else None
+
+    # 모든 path를 한 번에 polyline으로 근사 (i번째 path = points[offsets[i]:offsets[i+1]])
+    points, offsets = flatten_paths(parsed_paths, svg_tolerance, steps_bezier, steps_arc)
+    if simplify_tolerance is not None:
+        n_segments = len(points) - (len(offsets) - 1)
+        points, offsets, removed = simplify_polylines(points, offsets, simplify_tolerance / scale)
+        print(f"Simplified: removed {removed} of {n_segments} segments")
+    polylines = [polyline.tolist() for polyline in iter_polylines(points, offsets)]
+
+    # polyline → 회전/전진 명령 목록 → 불필요한 명령 정리
+    commands = polyline_commands(polylines, scale, angle_offset, arc_tolerance, reverse)
+    optimized = coalesce_commands(commands, min_distance, min_angle)
+    print(f"Robot commands: {count_motion(commands)} -> {count_motion(optimized)}")
+    return optimized
+
+
+# --- 스트리밍: path가 하나씩 들어오는 대로 명령을 만들어 내보냄 ---
+def iter_plan(paths, scale=0.07, steps_bezier=10, steps_arc=10, angle_offset=0, tolerance=0.1,
+              min_distance=0.01, min_angle=0.1, arc_tolerance=None, simplify_tolerance=None, reverse=False):
+    # paths: iter_svg()처럼 path(dict 목록)를 하나씩 내보내는 iterator
+    from flatten import flatten_paths
+    from simplify import simplify_polylines
+    tolerance = flatten_tolerance(tolerance, arc_tolerance)
+    svg_tolerance = tolerance / scale if tolerance is not None else None
+    polylines = (flatten_paths([path], svg_tolerance, steps_bezier, steps_arc) for path in paths)
+    if simplify_tolerance is not None:
+        polylines = (simplify_polylines(points, offsets, simplify_tolerance / scale)[:2] for points, offsets in polylines)
+    polylines = (points.tolist() for points, _ in polylines)
+    commands = iter_polyline_commands(polylines, scale, angle_offset, arc_tolerance, reverse)
+    return iter_coalesce(commands, min_distance, min_angle)
+
+
+# --- 명령 실행 ---
+def run_command(h, command):
+    op, value = command
+    if op == 'turn':
+        if value > 0:
+            h.turn_right(abs(value))
+        else:
+            h.turn_left(abs(value))
+    elif op == 'forward':
+        if value < 0:
+            h.move_backward(-value)
+        else:
+            h.move_forward(value)
+    elif op == 'arc':
+        run_arc(h, *value)
+    elif op == 'path_start':
+        print(f"Starting Path {value+1}...")
+        # 계측용 로봇(instrument.TracedRobot)이면 path 구간을 알려줌
+        if hasattr(h, 'path_started'):
+            h.path_started(value)
+    elif op == 'path_end':
+        print(f"Path {value+1} completed.\n")
+        if hasattr(h, 'path_ended'):
+            h.path_ended(value)
+
+def run_arc(h, sweep, radius):
+    # swing 명령이 있는 로봇은 바퀴 속도 차이로 한 번에 원호를 그림
+    if sweep > 0 and hasattr(h, 'swing_right'):
+        h.swing_right(abs(sweep), radius)
+        return
+    if sweep <= 0 and hasattr(h, 'swing_left'):
+        h.swing_left(abs(sweep), radius)
+        return
+
+    # 없으면 현으로 나눠 회전+전진: 현 방향은 양 끝 접선의 중간이므로 처음/끝에 반 칸씩 회전
+    if radius <= ARC_FALLBACK_TOLERANCE:
+        steps = 1
+    else:
+        step = 2 * math.degrees(math.acos(1 - ARC_FALLBACK_TOLERANCE / radius))
+        steps = max(1, math.ceil(abs(sweep) / step))
+    angle = sweep / steps
+    chord = 2 * radius * math.sin(math.radians(abs(angle)) / 2)
+    turn = angle / 2
+    for _ in range(steps):
+        run_command(h, ('turn', turn))
+        h.move_forward(chord)
+        turn = angle
+    run_command(h, ('turn', angle / 2))
+
+def run_commands(h, commands, cancelled=None):
+    # cancelled: threading.Event, set()되면 현재 명령이 끝난 뒤 멈춤
+    for command in commands:
+        if cancelled is not None and cancelled.is_set():
+            return
+        run_command(h, command)
@@ -0,0 +1,195 @@
+# multi_robot.py
+# 큰 그림을 여러 로봇이 나눠서 동시에 그리는 모듈
+#   - 그림을 세로 띠(strip)로 나누되, 띠마다 예상 그리기 시간이 비슷하도록 경계를 정함
+#   - 이웃한 띠 사이의 경계 근처(충돌 구역)는 lock으로 한 번에 한 로봇만 들어가게 함
+#   - 각 로봇은 자기 첫 path의 시작점(origin)에 +x 방향을 보게 놓고 시작
+# 실행(시뮬레이션 비교): python multi_robot.py [SVG 파일] [로봇 수]
+import time
+import threading
+import numpy as np
+from segments import SegmentStore
+from flatten import flatten_paths
+from path_planner import order_paths, path_start, path_end
+from motion_plan import compile_plan, run_command
+
+
+# --- path별 범위 / 예상 시간 ---
+def path_bounds(points, offsets):
+    # path별 (xmin, ymin, xmax, ymax), shape (P, 4)
+    lo = np.minimum.reduceat(points, offsets[:-1])
+    hi = np.maximum.reduceat(points, offsets[:-1])
+    return np.hstack([lo, hi])
+
+def estimate_path_times(points, offsets, scale=0.07, move_speed=5.0, command_latency=0.1):
+    # 선 길이 / 속도 + 점마다 회전·전진 명령 2개의 지연 (대략적인 값, 나누는 비율에만 사용)
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    steps[offsets[1:-1] - 1] = 0.0   # path와 path 사이는 제외
+    lengths = np.add.reduceat(np.append(steps, 0.0), offsets[:-1])
+    return lengths * scale / move_speed + (np.diff(offsets) - 1) * 2 * command_latency
+
+
+# --- 나누기 ---
+def partition_paths(parsed_paths, n_robots, scale=0.07, tolerance=0.1, clearance=5.0,
+                    move_speed=5.0, command_latency=0.1):
+    # 반환: (로봇별 path 번호 배열 목록, 충돌 구역 목록 [(x_lo, x_hi), ...])
+    #   충돌 구역 i는 로봇 i와 i+1 사이이며 SVG 좌표, clearance(cm)는 로봇 크기를 고려한 여유
+    store = SegmentStore.from_paths(parsed_paths)
+    svg_tolerance = tolerance / scale if tolerance is not None else None
+    points, offsets = flatten_paths(store, svg_tolerance)
+    bounds = path_bounds(points, offsets)
+    times = estimate_path_times(points, offsets, scale, move_speed, command_latency)
+
+    # path 중심의 x 순서로 세운 뒤 누적 시간이 같은 간격이 되는 곳에서 자름
+    centers = (bounds[:, 0] + bounds[:, 2]) / 2
+    order = np.argsort(centers, kind="stable")
+    cumulative = np.cumsum(times[order])
+    cuts = np.searchsorted(cumulative, cumulative[-1] * np.arange(1, n_robots) / n_robots)
+    groups = [group for group in np.split(order, cuts) if len(group)]
+
+    # 충돌 구역: 경계에서 양쪽 path가 실제로 뻗어 나간 범위 + clearance
+    margin = clearance / scale
+    zones = []
+    for left, right in zip(groups[:-1], groups[1:]):
+        boundary = (centers[left].max() + centers[right].min()) / 2
+        zones.append((float(min(boundary, bounds[right, 0].min()) - margin),
+                      float(max(boundary, bounds[left, 2].max()) + margin)))
+    return groups, zones
+
+def _zones_for(x_lo, x_hi, zones, group_index):
+    # 이 x 범위가 걸치는 이웃 충돌 구역 번호 (자기 띠 양옆 경계만 봄)
+    need = set()
+    for zone in (group_index - 1, group_index):
+        if 0 <= zone < len(zones) and x_lo <= zones[zone][1] and x_hi >= zones[zone][0]:
+            need.add(zone)
+    return need
+
+
+# --- 로봇별 plan ---
+def plan_robot(parsed_paths, indices, zones, group_index, scale=0.07, order=True, **params):
+    # 반환: origin(로봇을 놓을 위치, cm), plan, blocks[(필요한 충돌 구역, 명령 목록)], 예상 시간
+    store = SegmentStore.from_paths(parsed_paths)
+    paths = [store[int(i)] for i in indices]
+
+    # 왼쪽 구역 → 안쪽 → 오른쪽 구역 순서로 그림
+    # 이웃 로봇은 같은 구역을 반대 순서(처음/마지막)에 그리므로 서로 기다릴 일이 적음
+    points, offsets = flatten_paths(paths)
+    bounds = path_bounds(points, offsets)
+    left, inner, right = [], [], []
+    for path, (x_lo, _, x_hi, _) in zip(paths, bounds):
+        need = _zones_for(x_lo, x_hi, zones, group_index)
+        (left if group_index - 1 in need else right if group_index in need else inner).append(path)
+    if order:
+        left, inner, right = [order_paths(part)[0] if part else part for part in (left, inner, right)]
+    paths = left + inner + right
+    plan = compile_plan(paths, scale=scale, **params)
+
+    # path마다 필요한 구역 (transit은 직전 path 끝점과 이 path 시작점 사이, 그리기는 path 범위)
+    points, offsets = flatten_paths(paths)
+    bounds = path_bounds(points, offsets)
+    needs = []
+    for i, (x_lo, _, x_hi, _) in enumerate(bounds):
+        x = path_start(paths[i])[0]
+        x_prev = path_end(paths[i-1])[0] if i > 0 else x
+        needs.append((_zones_for(min(x, x_prev), max(x, x_prev), zones, group_index),
+                      _zones_for(x_lo, x_hi, zones, group_index)))
+
+    # transit과 path 그리기를 각각 하나의 block으로 만듦
+    blocks = []
+    commands = []
+    for command in plan:
+        op, value = command
+        if op == 'path_start' and commands:
+            blocks.append((needs[value][0], commands))
+            commands = []
+        commands.append(command)
+        if op == 'path_end':
+            blocks.append((needs[value][1], commands))
+            commands = []
+    if commands:
+        blocks.append((set(), commands))
+
+    origin = path_start(paths[0])
+    return {
+        "origin": (origin[0] * scale, origin[1] * scale),
+        "paths": len(paths),
+        "plan": plan,
+        "blocks": blocks,
+        "estimated_time": float(estimate_path_times(points, offsets, scale).sum()),
+    }
+
+
+# --- 동시 실행 ---
+def run_blocks(h, blocks, locks):
+    # 충돌 구역 lock은 항상 번호 순서대로 잡음 (교착 방지)
+    # 새로 잡을 구역보다 번호가 큰 lock을 들고 있으면 먼저 놓고 다시 잡음
+    held = set()
+    try:
+        for need, commands in blocks:
+            new = need - held
+            for zone in sorted(held, reverse=True):
+                if zone not in need or (new and zone > min(new)):
+                    locks[zone].release()
+                    held.discard(zone)
+            for zone in sorted(need - held):
+                locks[zone].acquire()
+                held.add(zone)
+            for command in commands:
+                run_command(h, command)
+    finally:
+        for zone in held:
+            locks[zone].release()
+
+def draw_parallel(parsed_paths, robots, scale=0.07, tolerance=0.1, clearance=5.0, order=True,
+                  move_speed=5.0, command_latency=0.1, **params):
+    # robots: create_robot()로 만든 로봇 목록, params: compile_plan()의 나머지 인자
+    groups, zones = partition_paths(parsed_paths, len(robots), scale, tolerance, clearance,
+                                    move_speed, command_latency)
+    jobs = [plan_robot(parsed_paths, group, zones, i, scale, order, tolerance=tolerance, **params)
+            for i, group in enumerate(groups)]
+    for i, job in enumerate(jobs):
+        print(f"Robot {i}: {job['paths']} paths, start at ({job['origin'][0]:.1f}, {job['origin'][1]:.1f}) cm "
+              f"facing +x, estimated {job['estimated_time']:.1f} s")
+
+    locks = [threading.Lock() for _ in zones]
+    errors = []
+    def worker(h, blocks):
+        try:
+            run_blocks(h, blocks, locks)
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(h, job["blocks"])) for h, job in zip(robots, jobs)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if errors:
+        raise errors[0]
+    return {"jobs": jobs, "zones": zones, "elapsed": elapsed}
+
+
+if __name__ == "__main__":
+    import io
+    import sys
+    import contextlib
+    from svg_parser import parse_svg
+    from robots import SimulatedTurtle
+
+    svg_file_path = sys.argv[1] if len(sys.argv) > 1 else "Mouse.svg"
+    n_robots = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    time_scale = 0.002   # 시뮬레이션 1초를 2ms로 줄여 실제로 기다림
+    parsed_paths = parse_svg(svg_file_path)
+
+    results = {}
+    for n in (1, n_robots):
+        robots = [SimulatedTurtle(realtime=True, time_scale=time_scale) for _ in range(n)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = draw_parallel(parsed_paths, robots)
+        makespan = report["elapsed"] / time_scale
+        results[n] = makespan
+        busy = ", ".join(f"{robot.elapsed:.1f}" for robot in robots)
+        print(f"{n} robot(s): {makespan:.1f} s (simulated), per robot [{busy}] s")
+    print(f"Speedup: {results[1] / results[n_robots]:.2f}x")
@@ -0,0 +1,344 @@
+# path_planner.py
+# parse_svg() 결과의 path 순서와 방향을 정해 펜을 든 채 이동하는 거리(transit)를 줄입니다.
+import math
+
+
+# --- path 시작/끝점 ---
+def circle_start(segment):
+    # execute_path의 circle은 각도 0(중심 오른쪽)에서 시작해 한 바퀴 돌아 같은 점에서 끝남
+    cx, cy = segment['center']
+    return (cx + segment['radius'], cy)
+
+def path_start(path):
+    first = path[0]
+    if first['type'] == 'circle':
+        return circle_start(first)
+    return first['start']
+
+def path_end(path):
+    last = path[-1]
+    if last['type'] == 'circle':
+        return circle_start(last)
+    return last['end']
+
+def is_closed(path):
+    return path[-1]['type'] in ('Z', 'circle')
+
+def is_reversible(path):
+    # 원호(A)도 start/end를 바꾸고 sweep을 뒤집으면 같은 선이 되므로 열린 path는 모두 뒤집을 수 있음
+    return True
+
+
+# --- path 변형 (뒤집기 / 닫힌 path 시작점 변경) ---
+def reverse_path(path):
+    start = path_end(path)
+    reversed_data = [{"type": "M", "start": start, "end": start}]
+
+    for segment in reversed(path):
+        seg_type = segment['type']
+        if seg_type == 'M':
+            continue
+        elif seg_type in ('L', 'Z'):
+            reversed_data.append({"type": "L", "start": segment['end'], "end": segment['start']})
+        elif seg_type == 'C':
+            reversed_data.append({
+                "type": "C",
+                "start": segment['end'],
+                "control1": segment['control2'],
+                "control2": segment['control1'],
+                "end": segment['start']
+            })
+        elif seg_type == 'Q':
+            reversed_data.append({
+                "type": "Q",
+                "start": segment['end'],
+                "control": segment['control'],
+                "end": segment['start']
+            })
+        elif seg_type == 'A':
+            reversed_data.append({
+                "type": "A",
+                "start": segment['end'],
+                "end": segment['start'],
+                "center": segment['center'],
+                "radius": segment['radius'],
+                "sweep": not segment.get('sweep', True)
+            })
+        else:
+            raise ValueError(f"{seg_type} 세그먼트는 뒤집을 수 없습니다.")
+
+    return reversed_data
+
+def _closed_body(path):
+    # M/Z를 뺀 실제 그리기 세그먼트 목록 (길이가 있는 Z는 L로 바꿔 포함)
+    body = [segment for segment in path if segment['type'] not in ('M', 'Z')]
+    last = path[-1]
+    if last['type'] == 'Z' and last['start'] != last['end']:
+        body.append({"type": "L", "start": last['start'], "end": last['end']})
+    return body
+
+def rotate_closed_path(path, k):
+    # 닫힌 path를 k번째 세그먼트의 시작점부터 그리도록 재배열
+    if k == 0 or path[-1]['type'] != 'Z':
+        return path
+
+    body = _closed_body(path)
+    body = body[k:] + body[:k]
+    start = body[0]['start']
+    return ([{"type": "M", "start": start, "end": start}] + body +
+            [{"type": "Z", "start": body[-1]['end'], "end": start}])
+
+
+# --- 진행 방향 (회전 비용 계산용) ---
+def _direction(p, q):
+    return math.degrees(math.atan2(-(q[1]-p[1]), q[0]-p[0]))
+
+def _segment_points(segment):
+    seg_type = segment['type']
+    if seg_type == 'C':
+        return [segment['start'], segment['control1'], segment['control2'], segment['end']]
+    elif seg_type == 'Q':
+        return [segment['start'], segment['control'], segment['end']]
+    return [segment['start'], segment['end']]
+
+def _start_heading(path):
+    first = path[0]
+    if first['type'] == 'circle':
+        return _direction((0, 0), (0, 1))
+    for segment in path:
+        if segment['type'] == 'M':
+            continue
+        points = _segment_points(segment)
+        for point in points[1:]:
+            if point != points[0]:
+                return _direction(points[0], point)
+    return None
+
+def _end_heading(path):
+    last = path[-1]
+    if last['type'] == 'circle':
+        return _direction((0, 0), (0, 1))
+    for segment in reversed(path):
+        if segment['type'] == 'M':
+            continue
+        points = _segment_points(segment)
+        for point in reversed(points[:-1]):
+            if point != points[-1]:
+                return _direction(point, points[-1])
+    return None
+
+def _turn(a, b):
+    if a is None or b is None:
+        return 0.0
+    diff = abs(b - a) % 360
+    return 360 - diff if diff > 180 else diff
+
+
+# --- 격자 기반 공간 인덱스 ---
+class GridIndex:
+    def __init__(self, points, cell_size):
+        self.cell_size = cell_size
+        self.points = points
+        self.cells = {}
+        for i, (x, y) in enumerate(points):
+            self.cells.setdefault(self._key(x, y), set()).add(i)
+        keys = list(self.cells) or [(0, 0)]
+        self.bounds = (min(k[0] for k in keys), max(k[0] for k in keys),
+                       min(k[1] for k in keys), max(k[1] for k in keys))
+
+    def _key(self, x, y):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def remove(self, i):
+        key = self._key(*self.points[i])
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell.discard(i)
+            if not cell:
+                del self.cells[key]
+
+    def nearest(self, point, k=1):
+        # 격자를 한 겹씩 넓혀 가며 가까운 점 k개를 찾음
+        cx, cy = self._key(*point)
+        x0, x1, y0, y1 = self.bounds
+        max_ring = max(abs(cx - x0), abs(cx - x1), abs(cy - y0), abs(cy - y1))
+        found = []
+        for ring in range(max_ring + 1):
+            for gx in range(cx - ring, cx + ring + 1):
+                step = 1 if abs(gx - cx) == ring else 2 * ring
+                for gy in range(cy - ring, cy + ring + 1, max(step, 1)):
+                    for i in self.cells.get((gx, gy), ()):
+                        found.append((math.dist(point, self.points[i]), i))
+            # ring 바깥의 점은 ring * cell_size 보다 가까울 수 없음
+            if len(found) >= k:
+                found.sort()
+                if found[k-1][0] <= ring * self.cell_size:
+                    break
+        found.sort()
+        return found[:k]
+
+
+# --- transit 거리 계산 ---
+def transit_distance(parsed_paths):
+    total = 0.0
+    for prev, nxt in zip(parsed_paths, parsed_paths[1:]):
+        total += math.dist(path_end(prev), path_start(nxt))
+    return total
+
+def transit_turn(parsed_paths):
+    # path 사이 이동에서 생기는 회전량(도) 합계
+    total = 0.0
+    for prev, nxt in zip(parsed_paths, parsed_paths[1:]):
+        end, start = path_end(prev), path_start(nxt)
+        if end == start:
+            total += _turn(_end_heading(prev), _start_heading(nxt))
+        else:
+            transit_heading = _direction(end, start)
+            total += _turn(_end_heading(prev), transit_heading) + _turn(transit_heading, _start_heading(nxt))
+    return total
+
+
+# --- 경로 순서 최적화 (nearest neighbour + 2-opt) ---
+def order_paths(parsed_paths, turn_weight=0.05, k_neighbors=8, max_passes=10):
+    # turn_weight: 회전 1도를 SVG 단위 이동거리로 환산한 값
+    paths = [path for path in parsed_paths if path]
+    if len(paths) < 2:
+        report = {"transit_before": 0.0, "transit_after": 0.0,
+                  "turn_before": 0.0, "turn_after": 0.0}
+        return list(paths), report
+
+    # 각 path가 가질 수 있는 진입 방식: ('fwd'), ('rev'), 닫힌 path는 세그먼트 k에서 시작
+    entries = []
+    for index, path in enumerate(paths):
+        if is_closed(path):
+            if path[-1]['type'] == 'Z':
+                body = _closed_body(path)
+                for k, segment in enumerate(body):
+                    entries.append((segment['start'], index, k))
+            else:
+                entries.append((path_start(path), index, 0))
+        else:
+            entries.append((path_start(path), index, 'fwd'))
+            if is_reversible(path):
+                entries.append((path_end(path), index, 'rev'))
+
+    points = [entry[0] for entry in entries]
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    extent = max(max(xs) - min(xs), max(ys) - min(ys), 1e-9)
+    cell_size = extent / max(1, math.sqrt(len(points)))
+    index = GridIndex(points, cell_size)
+    entries_of = {}
+    for i, entry in enumerate(entries):
+        entries_of.setdefault(entry[1], []).append(i)
+
+    variants = {}
+    def variant(path_idx, mode):
+        key = (path_idx, mode)
+        if key not in variants:
+            path = paths[path_idx]
+            if mode == 'rev':
+                path = reverse_path(path)
+            elif isinstance(mode, int):
+                path = rotate_closed_path(path, mode)
+            variants[key] = (path, path_start(path), path_end(path),
+                             _start_heading(path), _end_heading(path))
+        return variants[key]
+
+    def take(path_idx):
+        for i in entries_of[path_idx]:
+            index.remove(i)
+
+    # 1) nearest neighbour: 원래 첫 path에서 시작해 비용이 가장 작은 진입점을 차례로 선택
+    tour = [(0, 0 if is_closed(paths[0]) else 'fwd')]
+    take(0)
+    _, _, position, _, heading = variant(*tour[0])
+
+    for _ in range(len(paths) - 1):
+        best = None
+        for dist, i in index.nearest(position, k_neighbors):
+            _, path_idx, mode = entries[i]
+            _, start, _, start_heading, _ = variant(path_idx, mode)
+            if dist > 0:
+                transit_heading = _direction(position, start)
+                turn = _turn(heading, transit_heading) + _turn(transit_heading, start_heading)
+            else:
+                turn = _turn(heading, start_heading)
+            cost = dist + turn_weight * turn
+            if best is None or cost < best[0]:
+                best = (cost, path_idx, mode)
+        _, path_idx, mode = best
+        take(path_idx)
+        tour.append((path_idx, mode))
+        _, _, position, _, heading = variant(path_idx, mode)
+
+    # 2) 2-opt: 구간 [i+1, j]를 뒤집으면 그 안의 path들도 방향이 바뀜
+    def flip(item):
+        path_idx, mode = item
+        if mode == 'fwd':
+            return (path_idx, 'rev')
+        elif mode == 'rev':
+            return (path_idx, 'fwd')
+        return item
+
+    def flippable(item):
+        path_idx, mode = item
+        return isinstance(mode, int) or is_reversible(paths[path_idx])
+
+    def start_of(item):
+        return variant(*item)[1]
+
+    def end_of(item):
+        return variant(*item)[2]
+
+    # 뒤집을 수 없는 path(is_reversible이 False인 열린 path)의 누적 개수: 구간 안에 하나라도 있으면 2-opt 불가
+    fixed = [0]
+    for item in tour:
+        fixed.append(fixed[-1] + (not flippable(item)))
+
+    for _ in range(max_passes):
+        improved = False
+        end_points = [end_of(item) for item in tour]
+        # 패스 중간에 순서가 바뀌어도 후보 탐색용으로만 쓰므로 인덱스는 패스마다 한 번만 만듦
+        end_index = GridIndex(end_points, cell_size)
+        for i in range(len(tour) - 1):
+            b_i = end_of(tour[i])
+            for _, j in end_index.nearest(b_i, k_neighbors):
+                if j <= i + 1 or fixed[j+1] - fixed[i+1]:
+                    continue
+                a_next = start_of(tour[i+1])
+                b_j = end_of(tour[j])
+                delta = math.dist(b_i, b_j) - math.dist(b_i, a_next)
+                if j + 1 < len(tour):
+                    # 뒤집힌 뒤 tour[i+1]의 끝점은 원래의 시작점이 됨
+                    a_after = start_of(tour[j+1])
+                    delta += math.dist(a_next, a_after) - math.dist(b_j, a_after)
+                if delta < -1e-9:
+                    tour[i+1:j+1] = [flip(item) for item in reversed(tour[i+1:j+1])]
+                    improved = True
+        if not improved:
+            break
+
+    # 3) 닫힌 path는 앞뒤 path 기준으로 가장 가까운 시작 세그먼트를 다시 선택
+    for pos, (path_idx, mode) in enumerate(tour):
+        if not isinstance(mode, int) or paths[path_idx][-1]['type'] != 'Z':
+            continue
+        prev_end = end_of(tour[pos-1]) if pos > 0 else None
+        next_start = start_of(tour[pos+1]) if pos + 1 < len(tour) else None
+        best = None
+        for k, segment in enumerate(_closed_body(paths[path_idx])):
+            point = segment['start']
+            cost = ((math.dist(prev_end, point) if prev_end is not None else 0) +
+                    (math.dist(point, next_start) if next_start is not None else 0))
+            if best is None or cost < best[0]:
+                best = (cost, k)
+        tour[pos] = (path_idx, best[1])
+
+    ordered = [variant(*item)[0] for item in tour]
+    report = {
+        "transit_before": transit_distance(paths),
+        "transit_after": transit_distance(ordered),
+        "turn_before": transit_turn(paths),
+        "turn_after": transit_turn(ordered),
+    }
+    return ordered, report
@@ -0,0 +1,121 @@
+# plan_cache.py
+# 컴파일된 명령 목록(plan)을 바이너리 파일로 저장/불러오는 모듈
+# 파일 이름은 SVG 내용 + 파라미터의 해시이므로, 같은 그림을 다시 그릴 때 파싱/근사를 건너뜀
+import os
+import json
+import struct
+import hashlib
+from array import array
+
+PLAN_MAGIC = b"HPLN"
+PLAN_VERSION = 2
+
+# 파싱/순서 최적화/컴파일 결과가 바뀌면 올림 (같은 SVG와 파라미터라도 이전 plan을 다시 쓰지 않도록 캐시 키에 포함)
+#   1: subpath를 별도 path로 나누고 circle을 한 번만 그림
+#   2: 합친 전진은 첫 방향이 아니라 실제 끝점을 향함
+#   3: 원호는 현과 원호 사이 거리까지 arc_tolerance 안에 들 때만 묶고, arc를 쓰면 곡선을 더 잘게 근사
+#   4: 가로/세로 배율이 다른 변환 안의 원호는 베지어로 바꿈
+#   5: 합친 후진 이동의 방향 계산 수정
+#   6: SVG 원호의 sweep-flag(그리는 방향)와 기울어진 타원 원호를 반영하고, 원호가 있는 열린 path도 뒤집음
+COMPILER_VERSION = 6
+
+# 명령 종류 ↔ 1바이트 코드
+OP_CODES = {"turn": 0, "forward": 1, "path_start": 2, "path_end": 3, "arc": 4}
+OP_NAMES = {code: op for op, code in OP_CODES.items()}
+
+# 헤더: magic(4) + version(uint16) + 명령 개수(uint32)
+_HEADER = struct.Struct("<4sHI")
+
+
+# --- 캐시 키 ---
+def plan_key(svg_file_path, **params):
+    digest = hashlib.sha256()
+    with open(svg_file_path, "rb") as f:
+        digest.update(f.read())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    digest.update(f"{PLAN_VERSION}.{COMPILER_VERSION}".encode())
+    return digest.hexdigest()
+
+
+# --- 저장 / 불러오기 ---
+# 본문: 명령 코드 n바이트 + 값 n개 + 두 번째 값 n개(float64, little endian)
+#   두 번째 값은 arc의 반지름이며 다른 명령은 0
+def save_plan(file_path, commands):
+    ops = array("B", (OP_CODES[op] for op, _ in commands))
+    values = array("d", (value[0] if op == "arc" else value for op, value in commands))
+    values2 = array("d", (value[1] if op == "arc" else 0.0 for op, value in commands))
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        values.byteswap()
+        values2.byteswap()
+
+    # 쓰는 도중 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    # (여러 프로세스가 같은 plan을 동시에 저장할 수 있으므로 임시 파일 이름에 pid를 붙임)
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(PLAN_MAGIC, PLAN_VERSION, len(commands)))
+        f.write(ops.tobytes())
+        f.write(values.tobytes())
+        f.write(values2.tobytes())
+    os.replace(tmp_path, file_path)
+
+def load_plan(file_path):
+    with open(file_path, "rb") as f:
+        magic, version, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != PLAN_MAGIC or version != PLAN_VERSION:
+            raise ValueError(f"지원하지 않는 plan 파일입니다: {file_path}")
+        ops = array("B")
+        ops.frombytes(f.read(count))
+        values = array("d")
+        values.frombytes(f.read(count * values.itemsize))
+        values2 = array("d")
+        values2.frombytes(f.read(count * values2.itemsize))
+
+    if len(ops) != count or len(values) != count or len(values2) != count:
+        raise ValueError(f"plan 파일이 손상되었습니다: {file_path}")
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        values.byteswap()
+        values2.byteswap()
+
+    commands = []
+    for code, value, value2 in zip(ops, values, values2):
+        op = OP_NAMES[code]
+        # path 번호는 정수로, arc는 (각도, 반지름)으로 되돌림
+        if op in ("path_start", "path_end"):
+            value = int(value)
+        elif op == "arc":
+            value = (value, value2)
+        commands.append((op, value))
+    return commands
+
+
+# --- 캐시를 거친 plan 얻기 ---
+def cached_plan(svg_file_path, cache_dir=".plan_cache", order=True, unit="px", paper_size=None,
+                return_cached=False, **params):
+    # unit, paper_size: parse_svg()의 인자 (paper_size를 주면 그림을 종이에 맞춤)
+    # return_cached: True면 (plan, 캐시에서 불러왔는지)를 반환
+    # params: compile_plan()의 인자 (scale, angle_offset, steps_bezier, steps_arc, tolerance, arc_tolerance, ...)
+    key = plan_key(svg_file_path, order=order, unit=unit, paper_size=paper_size, **params)
+    cache_path = os.path.join(cache_dir, key + ".plan")
+
+    if os.path.exists(cache_path):
+        try:
+            plan = load_plan(cache_path)
+            print(f"Loaded cached plan: {cache_path}")
+            return (plan, True) if return_cached else plan
+        except (ValueError, struct.error, KeyError):
+            print(f"Ignoring broken plan cache: {cache_path}")
+
+    from svg_parser import parse_svg
+    from path_planner import order_paths
+    from motion_plan import compile_plan
+
+    parsed_paths = parse_svg(svg_file_path, unit, paper_size)
+    if order:
+        # 펜을 든 채 이동하는 거리(transit)가 줄어들도록 path 순서/방향 재배치
+        parsed_paths, order_report = order_paths(parsed_paths)
+        print(f"Transit distance: {order_report['transit_before']:.1f} -> {order_report['transit_after']:.1f}")
+    plan = compile_plan(parsed_paths, **params)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    save_plan(cache_path, plan)
+    return (plan, False) if return_cached else plan
@@ -0,0 +1,247 @@
+# pose.py
+# 추정 위치(dead reckoning)를 기준으로 매 이동을 다시 계산하는 실행기와 로봇별 보정 모델
+# 좌표계는 plan과 같음: 위치는 로봇 단위(cm), 방향은 도이며 turn_right(v)이면 방향 += v
+#   (plan_move의 target_angle과 같은 기준이므로 plan의 명령값을 그대로 적분할 수 있음)
+import os
+import json
+import math
+from motion_plan import run_command
+
+
+def _wrap(angle):
+    angle = (angle + 180) % 360 - 180
+    return 180.0 if angle == -180 else angle
+
+def arc_end(x, y, heading, sweep, radius):
+    # plan 좌표계에서 (x, y, heading)으로 시작해 반지름 radius로 sweep만큼 돈 뒤의 위치
+    chord = 2 * radius * math.sin(math.radians(abs(sweep)) / 2)
+    rad = math.radians(heading + sweep / 2)
+    return x + chord*math.cos(rad), y - chord*math.sin(rad), heading + sweep
+
+
+# --- 로봇별 보정 모델 ---
+# 실제 회전/이동 = gain * 명령값 + bias (명령값 > 0일 때, 방향별로 따로 보정)
+class MotionModel:
+    def __init__(self, left_gain=1.0, left_bias=0.0, right_gain=1.0, right_bias=0.0,
+                 distance_gain=1.0, distance_bias=0.0, heading_offset=0.0):
+        self.left_gain = left_gain
+        self.left_bias = left_bias
+        self.right_gain = right_gain
+        self.right_bias = right_bias
+        self.distance_gain = distance_gain
+        self.distance_bias = distance_bias
+        # plan 기준 로봇의 처음 방향 (기존 ANGLE_OFFSET은 heading_offset = -ANGLE_OFFSET과 같음)
+        self.heading_offset = heading_offset
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    # --- 원하는 회전/이동 → 로봇에 보낼 명령값 (모델의 역함수) ---
+    def turn_command(self, needed):
+        # needed > 0: 오른쪽 회전
+        gain, bias = (self.right_gain, self.right_bias) if needed > 0 else (self.left_gain, self.left_bias)
+        command = (abs(needed) - bias) / gain
+        return math.copysign(max(command, 0.0), needed)
+
+    def distance_command(self, needed):
+        command = (abs(needed) - self.distance_bias) / self.distance_gain
+        return math.copysign(max(command, 0.0), needed)
+
+    # --- 명령값 → 예상되는 실제 회전/이동 ---
+    def turn_effect(self, command):
+        if command == 0:
+            return 0.0
+        gain, bias = (self.right_gain, self.right_bias) if command > 0 else (self.left_gain, self.left_bias)
+        return math.copysign(gain * abs(command) + bias, command)
+
+    def distance_effect(self, command):
+        if command == 0:
+            return 0.0
+        return math.copysign(self.distance_gain * abs(command) + self.distance_bias, command)
+
+
+# --- 보정값 저장 / 불러오기 (로봇 이름별) ---
+def load_calibration(file_path="calibration.json", robot_name="default"):
+    if not os.path.exists(file_path):
+        return MotionModel()
+    with open(file_path) as f:
+        data = json.load(f)
+    if robot_name not in data:
+        return MotionModel()
+    return MotionModel.from_dict(data[robot_name])
+
+def save_calibration(model, file_path="calibration.json", robot_name="default"):
+    data = {}
+    if os.path.exists(file_path):
+        with open(file_path) as f:
+            data = json.load(f)
+    data[robot_name] = model.to_dict()
+    with open(file_path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+# --- 보정 루틴 ---
+CALIBRATION_TURNS = (90, 180, 360)
+CALIBRATION_MOVES = (5, 10, 20)
+
+def fit_linear(samples):
+    # (명령값, 실제값) 목록에 실제 = gain * 명령값 + bias 를 최소제곱으로 맞춤
+    n = len(samples)
+    sx = sum(c for c, _ in samples)
+    sy = sum(a for _, a in samples)
+    sxx = sum(c*c for c, _ in samples)
+    sxy = sum(c*a for c, a in samples)
+    denom = n * sxx - sx * sx
+    if n < 2 or denom == 0:
+        return (sy / sx if sx else 1.0), 0.0
+    gain = (n * sxy - sx * sy) / denom
+    bias = (sy - gain * sx) / n
+    return gain, bias
+
+def run_calibration(h, measure, turns=CALIBRATION_TURNS, moves=CALIBRATION_MOVES):
+    # 정해진 회전/이동을 하고, 매번 measure(kind, command)로 실제 값을 받아 모델을 맞춤
+    # kind: 'left' / 'right' (실제 회전 각도, 도), 'forward' (실제 이동 거리, cm)
+    samples = {'left': [], 'right': [], 'forward': []}
+    for degree in turns:
+        h.turn_left(degree)
+        samples['left'].append((degree, measure('left', degree)))
+        h.turn_right(degree)
+        samples['right'].append((degree, measure('right', degree)))
+    for cm in moves:
+        h.move_forward(cm)
+        samples['forward'].append((cm, measure('forward', cm)))
+
+    left_gain, left_bias = fit_linear(samples['left'])
+    right_gain, right_bias = fit_linear(samples['right'])
+    distance_gain, distance_bias = fit_linear(samples['forward'])
+    return MotionModel(left_gain, left_bias, right_gain, right_bias, distance_gain, distance_bias)
+
+def ask_measure(kind, command):
+    # 실제 로봇: 사람이 종이 위에서 잰 값을 입력
+    unit = "cm" if kind == 'forward' else "도"
+    return float(input(f"{kind} {command}{unit} 명령 → 실제로 움직인 값({unit}): "))
+
+def simulated_measure(sim):
+    # SimulatedTurtle: 직전 명령 전후의 실제 위치 차이를 잼
+    last = [sim.pose]
+    def measure(kind, command):
+        before, after = last[0], sim.pose
+        last[0] = after
+        if kind == 'forward':
+            return math.dist(before[:2], after[:2])
+        return abs(after[2] - before[2])
+    return measure
+
+
+# --- 추정 위치 기반 실행기 ---
+class PoseExecutor:
+    def __init__(self, h, model=None, min_distance=0.01, min_angle=0.1):
+        self.h = h
+        self.model = model or MotionModel()
+        self.min_distance = min_distance
+        self.min_angle = min_angle
+        # 이상적인(plan대로의) 위치와 보정 모델로 추정한 실제 위치
+        self.ideal = (0.0, 0.0, 0.0)
+        self.pose = (0.0, 0.0, self.model.heading_offset)
+
+    def correct(self, x, y, heading):
+        # 카메라 등으로 실제 위치를 잰 경우 추정 위치를 덮어씀
+        self.pose = (x, y, heading)
+
+    def _turn(self, needed):
+        command = self.model.turn_command(needed)
+        if abs(command) < self.min_angle:
+            return
+        run_command(self.h, ('turn', command))
+        x, y, heading = self.pose
+        self.pose = (x, y, heading + self.model.turn_effect(command))
+
+    def _forward(self, needed):
+        command = self.model.distance_command(needed)
+        if abs(command) < self.min_distance:
+            return
+        run_command(self.h, ('forward', command))
+        x, y, heading = self.pose
+        moved = self.model.distance_effect(command)
+        rad = math.radians(heading)
+        self.pose = (x + moved*math.cos(rad), y - moved*math.sin(rad), heading)
+
+    def run_command(self, command):
+        op, value = command
+        if op == 'turn':
+            # 회전은 다음 이동 목표를 향해 다시 계산하므로 이상적인 방향만 갱신
+            x, y, heading = self.ideal
+            self.ideal = (x, y, heading + value)
+        elif op == 'forward':
+            x, y, heading = self.ideal
+            rad = math.radians(heading)
+            target = (x + value*math.cos(rad), y - value*math.sin(rad))
+            self.ideal = (target[0], target[1], heading)
+            self.move_to(target, backward=value < 0)
+        elif op == 'arc':
+            # 추정 방향을 plan의 시작 방향에 맞춘 뒤 원호를 그림 (반지름은 거리 보정을 거침)
+            sweep, radius = value
+            self._turn(_wrap(self.ideal[2] - self.pose[2]))
+            command = (self.model.turn_command(sweep), self.model.distance_command(radius))
+            # forward처럼 이동 전에 목표 위치로 갱신
+            self.ideal = arc_end(*self.ideal, sweep, radius)
+            run_command(self.h, ('arc', command))
+            self.pose = arc_end(*self.pose, self.model.turn_effect(command[0]),
+                                self.model.distance_effect(command[1]))
+        else:
+            run_command(self.h, command)
+
+    def move_to(self, target, backward=False):
+        # 추정 위치에서 목표점까지 필요한 회전/이동을 다시 계산
+        x, y, heading = self.pose
+        dx, dy = target[0] - x, target[1] - y
+        distance = math.hypot(dx, dy)
+        if distance < 1e-9:
+            return
+        direction = math.degrees(math.atan2(-dy, dx))
+        if backward:
+            direction += 180
+            distance = -distance
+        self._turn(_wrap(direction - heading))
+        self._forward(distance)
+
+    def run(self, commands, start=0, checkpoint=None):
+        # start: 이 번호의 명령부터 실행, checkpoint: 명령마다 진행 상황을 저장 (checkpoint.Checkpoint)
+        for index in range(start, len(commands)):
+            ideal = self.ideal
+            try:
+                self.run_command(commands[index])
+            except BaseException:
+                # 명령 도중 끊기면 이 명령부터 다시 실행하도록 저장
+                # (이미 끝난 회전/이동은 추정 위치에 반영되어 있음, 끊긴 동작 자체의 진행 정도는 알 수 없음)
+                if checkpoint is not None:
+                    self.ideal = ideal
+                    checkpoint.save(self, index)
+                raise
+            if checkpoint is not None:
+                checkpoint.update(self, index + 1, commands[index])
+        if checkpoint is not None:
+            checkpoint.clear()
+        return self.pose
+
+    def error(self):
+        # 추정 위치와 plan상의 위치 차이 (cm)
+        return math.dist(self.pose[:2], self.ideal[:2])
+
+
+if __name__ == "__main__":
+    # 실행: python pose.py [roboid|sim] [로봇 이름]
+    import sys
+    from robots import create_robot
+
+    backend = sys.argv[1] if len(sys.argv) > 1 else "roboid"
+    robot_name = sys.argv[2] if len(sys.argv) > 2 else "default"
+    h = create_robot(backend)
+    measure = simulated_measure(h) if backend == "sim" else ask_measure
+    model = run_calibration(h, measure)
+    save_calibration(model, robot_name=robot_name)
+    print(f"Saved calibration for {robot_name}: {model.to_dict()}")
@@ -0,0 +1,166 @@
+# robots.py
+# 로봇 백엔드 선택 모듈
+# 백엔드는 turn_left(deg), turn_right(deg), move_forward(cm) 세 함수만 있으면 됨
+# swing_left(deg, radius) / swing_right(deg, radius)가 있으면 원호(arc) 명령을 한 번에 그림 (없으면 현으로 나눠 그림)
+#   - "roboid": 실제 Turtle 로봇 (roboid 패키지 필요)
+#   - "sim"   : 하드웨어 없이 동작하는 SimulatedTurtle
+import math
+import random
+import time
+
+
+# --- 시뮬레이션 로봇 ---
+# 좌표는 로봇 단위(cm), 방향은 도(deg)이며 0도 = +x, 왼쪽 회전 = 양의 방향
+class SimulatedTurtle:
+    def __init__(self, move_speed=5.0, turn_speed=90.0, command_latency=0.1,
+                 distance_gain=1.0, turn_gain=1.0, distance_noise=0.0, turn_noise=0.0,
+                 realtime=False, seed=None, time_scale=1.0):
+        # move_speed(cm/s), turn_speed(deg/s), command_latency(명령당 통신/정지 시간, s)
+        # *_gain: 명령값 대비 실제 이동/회전 비율, *_noise: 명령마다 더해지는 정규분포 오차의 표준편차
+        # realtime이면 실제로 기다림 (time_scale배로 줄여서, 여러 로봇을 동시에 돌려 볼 때 사용)
+        self.move_speed = move_speed
+        self.turn_speed = turn_speed
+        self.command_latency = command_latency
+        self.distance_gain = distance_gain
+        self.turn_gain = turn_gain
+        self.distance_noise = distance_noise
+        self.turn_noise = turn_noise
+        self.realtime = realtime
+        self.time_scale = time_scale
+        self.random = random.Random(seed)
+        # 오차를 잴 기준 위치 (x, y)를 돌려주는 함수, None이면 이 로봇이 받은 명령대로 움직였을 때의 위치
+        # PoseExecutor처럼 보정 모델로 명령값을 미리 바꾸는 실행기는 plan상의 위치를 넣어야 오차가 의미 있음
+        self.reference = None
+        self.reset()
+
+    def reset(self):
+        # pose: 실제(오차 포함) 위치, ideal_pose: 명령대로 움직였을 때의 위치
+        self.pose = (0.0, 0.0, 0.0)
+        self.ideal_pose = (0.0, 0.0, 0.0)
+        self.trace = [(0.0, 0.0)]
+        self.elapsed = 0.0
+        self.turn_count = 0
+        self.move_count = 0
+        self.total_distance = 0.0
+        self.total_rotation = 0.0
+        self.max_error = 0.0
+
+    # --- Turtle과 같은 이름의 명령 ---
+    def turn_left(self, degree=90, *args, **kwargs):
+        self._turn(degree)
+
+    def turn_right(self, degree=90, *args, **kwargs):
+        self._turn(-degree)
+
+    def move_forward(self, cm=6, *args, **kwargs):
+        self._move(cm)
+
+    def move_backward(self, cm=6, *args, **kwargs):
+        self._move(-cm)
+
+    def swing_left(self, degree=90, radius=6, *args, **kwargs):
+        self._arc(degree, radius)
+
+    def swing_right(self, degree=90, radius=6, *args, **kwargs):
+        self._arc(-degree, radius)
+
+    def dispose(self):
+        pass
+
+    # --- 내부 동작 ---
+    def _wait(self, duration):
+        duration += self.command_latency
+        self.elapsed += duration
+        if self.realtime:
+            time.sleep(duration * self.time_scale)
+
+    def _turn(self, degree):
+        self.turn_count += 1
+        self.total_rotation += abs(degree)
+
+        x, y, heading = self.ideal_pose
+        self.ideal_pose = (x, y, heading + degree)
+
+        actual = degree * self.turn_gain
+        if self.turn_noise:
+            actual += self.random.gauss(0, self.turn_noise)
+        x, y, heading = self.pose
+        self.pose = (x, y, heading + actual)
+
+        self._wait(abs(degree) / self.turn_speed if self.turn_speed else 0.0)
+
+    def _move(self, cm):
+        self.move_count += 1
+        self.total_distance += abs(cm)
+
+        x, y, heading = self.ideal_pose
+        rad = math.radians(heading)
+        self.ideal_pose = (x + cm*math.cos(rad), y + cm*math.sin(rad), heading)
+
+        actual = cm * self.distance_gain
+        if self.distance_noise:
+            actual += self.random.gauss(0, self.distance_noise)
+        x, y, heading = self.pose
+        rad = math.radians(heading)
+        self.pose = (x + actual*math.cos(rad), y + actual*math.sin(rad), heading)
+        self.trace.append(self.pose[:2])
+        self.max_error = max(self.max_error, self.position_error())
+
+        self._wait(abs(cm) / self.move_speed if self.move_speed else 0.0)
+
+    def _arc(self, degree, radius):
+        # 두 바퀴 속도를 달리해 반지름 radius(cm)인 원을 따라 degree만큼 돌며 이동 (멈추지 않으므로 명령 1개)
+        self.move_count += 1
+        length = math.radians(abs(degree)) * radius
+        self.total_distance += length
+
+        self.ideal_pose = self._arc_pose(self.ideal_pose, degree, radius)
+
+        actual = degree * self.turn_gain
+        if self.turn_noise:
+            actual += self.random.gauss(0, self.turn_noise)
+        actual_radius = radius * self.distance_gain
+        # 그리는 모양이 보이도록 trace에는 원호 위의 점을 10도 간격으로 남김
+        steps = max(1, math.ceil(abs(actual) / 10))
+        start = self.pose
+        for i in range(1, steps + 1):
+            self.pose = self._arc_pose(start, actual * i / steps, actual_radius)
+            self.trace.append(self.pose[:2])
+        self.max_error = max(self.max_error, self.position_error())
+
+        self._wait(length / self.move_speed if self.move_speed else 0.0)
+
+    @staticmethod
+    def _arc_pose(pose, degree, radius):
+        # 원호의 현은 시작/끝 방향의 중간 방향을 향함
+        x, y, heading = pose
+        chord = 2 * radius * math.sin(math.radians(abs(degree)) / 2)
+        rad = math.radians(heading + degree / 2)
+        return (x + chord*math.cos(rad), y + chord*math.sin(rad), heading + degree)
+
+    # --- 결과 ---
+    def position_error(self):
+        target = self.reference() if self.reference is not None else self.ideal_pose[:2]
+        return math.dist(self.pose[:2], target)
+
+    def summary(self):
+        return {
+            "commands": self.turn_count + self.move_count,
+            "turns": self.turn_count,
+            "moves": self.move_count,
+            "distance": self.total_distance,
+            "rotation": self.total_rotation,
+            "estimated_time": self.elapsed,
+            "final_error": self.position_error(),
+            "max_error": self.max_error,
+        }
+
+
+# --- 백엔드 생성 ---
+def create_robot(backend="roboid", **kwargs):
+    if backend == "roboid":
+        from roboid import Turtle
+        return Turtle(**kwargs)
+    elif backend == "sim":
+        return SimulatedTurtle(**kwargs)
+    raise ValueError(f"알 수 없는 로봇 백엔드입니다: {backend}")
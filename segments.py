@@ -0,0 +1,169 @@
+# segments.py
+# 세그먼트를 dict 대신 NumPy 배열(structure-of-arrays)로 저장하는 모듈
+import numpy as np
+
+# 세그먼트 종류 코드
+SEG_LINE = 0
+SEG_QUAD = 1
+SEG_CUBIC = 2
+SEG_ARC = 3
+SEG_CIRCLE = 4
+SEG_CLOSE = 5   # Z: 직선과 같지만 dict로 되돌릴 때 'Z'로 복원
+
+SEG_CODES = {"L": SEG_LINE, "Q": SEG_QUAD, "C": SEG_CUBIC, "A": SEG_ARC, "circle": SEG_CIRCLE, "Z": SEG_CLOSE}
+SEG_TYPES = {code: seg_type for seg_type, code in SEG_CODES.items()}
+
+
+# --- 세그먼트 저장소 ---
+# 모든 세그먼트의 제어점을 (S, 4, 2) 배열 하나에 담음
+#   L/Z: [start, end, end, end]          Q: [start, control, end, end]
+#   C: [start, control1, control2, end]  A: [start, end, center, radius]
+#   circle: [start, start, center, (r, r)]
+# A의 radius = (rx, ry)는 부호로 그리는 방향을 나타냄: 양수면 중심에서 본 각도가 증가하는 방향
+# (SVG sweep-flag=1), 음수면 감소하는 방향(sweep-flag=0). dict 형식에서는 양수 radius와 'sweep'으로 나눔
+# M은 따로 저장하지 않고 path별 시작점(starts)으로 대신함
+class SegmentStore:
+    def __init__(self, kinds, ctrl, path_offsets, starts):
+        self.kinds = np.asarray(kinds, dtype=np.int8)
+        self.ctrl = np.asarray(ctrl, dtype=np.float64).reshape(-1, 4, 2)
+        self.path_offsets = np.asarray(path_offsets, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def from_paths(cls, parsed_paths):
+        # 기존 dict 형식(list of list of dict)을 배열 형식으로 변환
+        if isinstance(parsed_paths, cls):
+            return parsed_paths
+
+        kinds = []
+        ctrl = []
+        path_offsets = [0]
+        starts = []
+
+        for path in parsed_paths:
+            for segment in path:
+                seg_type = segment['type']
+                if seg_type in ('L', 'Z'):
+                    ctrl.append((segment['start'], segment['end'], segment['end'], segment['end']))
+                elif seg_type == 'Q':
+                    ctrl.append((segment['start'], segment['control'], segment['end'], segment['end']))
+                elif seg_type == 'C':
+                    ctrl.append((segment['start'], segment['control1'], segment['control2'], segment['end']))
+                elif seg_type == 'A':
+                    sign = 1.0 if segment.get('sweep', True) else -1.0
+                    rx, ry = segment['radius']
+                    ctrl.append((segment['start'], segment['end'], segment['center'], (sign*abs(rx), sign*abs(ry))))
+                elif seg_type == 'circle':
+                    cx, cy = segment['center']
+                    r = segment['radius']
+                    ctrl.append(((cx + r, cy), (cx + r, cy), (cx, cy), (r, r)))
+                else:
+                    continue
+                kinds.append(SEG_CODES[seg_type])
+
+            # path의 첫 점 (circle은 중심 오른쪽 점)
+            first = path[0] if path else None
+            if first is None:
+                starts.append((0.0, 0.0))
+            elif first['type'] == 'circle':
+                starts.append((first['center'][0] + first['radius'], first['center'][1]))
+            else:
+                starts.append(first['start'])
+            path_offsets.append(len(kinds))
+
+        return cls(kinds, ctrl, path_offsets, starts)
+
+    # --- 기존 코드 호환용 view: path 하나를 dict 목록으로 만들어 반환 (읽기 전용) ---
+    def __len__(self):
+        return len(self.path_offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("path index out of range")
+        return self.path(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.path(index)
+
+    def path(self, index):
+        lo, hi = self.path_offsets[index], self.path_offsets[index+1]
+        kinds = self.kinds[lo:hi].tolist()
+        ctrl = self.ctrl[lo:hi].tolist()
+
+        path_data = []
+        if not (len(kinds) == 1 and kinds[0] == SEG_CIRCLE):
+            start = tuple(self.starts[index].tolist())
+            path_data.append({"type": "M", "start": start, "end": start})
+
+        for kind, (p0, p1, p2, p3) in zip(kinds, ctrl):
+            seg_type = SEG_TYPES[kind]
+            if kind in (SEG_LINE, SEG_CLOSE):
+                path_data.append({"type": seg_type, "start": tuple(p0), "end": tuple(p1)})
+            elif kind == SEG_QUAD:
+                path_data.append({"type": seg_type, "start": tuple(p0), "control": tuple(p1), "end": tuple(p2)})
+            elif kind == SEG_CUBIC:
+                path_data.append({"type": seg_type, "start": tuple(p0), "control1": tuple(p1),
+                                  "control2": tuple(p2), "end": tuple(p3)})
+            elif kind == SEG_ARC:
+                path_data.append({"type": seg_type, "start": tuple(p0), "end": tuple(p1),
+                                  "radius": (abs(p3[0]), abs(p3[1])), "center": tuple(p2), "sweep": p3[0] > 0})
+            elif kind == SEG_CIRCLE:
+                path_data.append({"type": seg_type, "center": tuple(p2), "radius": p3[0]})
+        return path_data
+
+    def to_paths(self):
+        return list(self)
+
+    @property
+    def nbytes(self):
+        return self.kinds.nbytes + self.ctrl.nbytes + self.path_offsets.nbytes + self.starts.nbytes
+
+
+# --- dict 형식과 메모리/시간 비교 ---
+def _compare(n_paths=2000, segments_per_path=50):
+    import time
+    import tracemalloc
+
+    rng = np.random.default_rng(0)
+    raw = (rng.random((n_paths, segments_per_path, 4, 2)) * 500).tolist()
+
+    # parse_svg가 만들던 dict 형식 (M, 세그먼트들, Z)
+    tracemalloc.start()
+    parsed_paths = []
+    for path in raw:
+        start = tuple(path[0][0])
+        path_data = [{"type": "M", "start": start, "end": start}]
+        for p0, p1, p2, p3 in path:
+            path_data.append({"type": "C", "start": tuple(p0), "control1": tuple(p1),
+                              "control2": tuple(p2), "end": tuple(p3)})
+        path_data.append({"type": "Z", "start": tuple(path[-1][3]), "end": start})
+        parsed_paths.append(path_data)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    store = SegmentStore.from_paths(parsed_paths)
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # 모든 세그먼트의 끝점 읽기
+    t = time.perf_counter()
+    ends = [segment['end'] for path in parsed_paths for segment in path]
+    dict_time = time.perf_counter() - t
+
+    t = time.perf_counter()
+    ends = store.ctrl[store.kinds == SEG_CUBIC, 3]
+    store_time = time.perf_counter() - t
+
+    print(f"{n_paths} paths, {n_paths * segments_per_path} segments")
+    print(f"memory: dict {dict_bytes/1e6:.1f} MB, store {store_bytes/1e6:.1f} MB")
+    print(f"read end points: dict {dict_time*1e3:.1f} ms, store {store_time*1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    _compare()
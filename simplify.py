@@ -0,0 +1,60 @@
+# simplify.py
+# polyline 단순화 (Ramer–Douglas–Peucker)
+# 트레이싱/CAD에서 나온 SVG는 아주 짧은 직선이 수천 개씩 있어서, 거의 한 직선 위에 있는 점들을 지워
+# 회전+전진 명령 수를 줄임. 모든 polyline의 모든 구간을 한 단계씩 NumPy로 한 번에 처리함
+import numpy as np
+
+
+def _segment_distance(p, a, b):
+    # 점 p (k, 2)에서 선분 a-b (k, 2)까지의 거리 (a == b면 점까지의 거리)
+    ab = b - a
+    length2 = np.einsum('ij,ij->i', ab, ab)
+    t = np.einsum('ij,ij->i', p - a, ab) / np.where(length2 > 0, length2, 1.0)
+    t = np.clip(t, 0.0, 1.0)
+    closest = a + ab * t[:, None]
+    return np.hypot(*(p - closest).T)
+
+def simplify_polylines(points, offsets, tolerance):
+    # points (N, 2), offsets (P+1,): flatten_paths()의 결과
+    # tolerance: points와 같은 단위, 지운 점과 남은 선 사이의 거리가 이보다 크지 않음
+    # 반환: (남은 points, 새 offsets, 지운 세그먼트 수)
+    points = np.asarray(points, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[offsets[:-1]] = True
+    keep[offsets[1:][offsets[1:] > offsets[:-1]] - 1] = True
+
+    # 아직 처리할 구간 [lo, hi] (양 끝은 남기는 점, 사이에 점이 하나 이상)
+    lo = offsets[:-1]
+    hi = offsets[1:] - 1
+    while True:
+        inner = hi - lo - 1
+        active = inner > 0
+        lo, hi, inner = lo[active], hi[active], inner[active]
+        if len(lo) == 0:
+            break
+
+        # 모든 구간의 안쪽 점을 한 배열로 펼쳐서 거리 계산
+        interval = np.repeat(np.arange(len(lo)), inner)
+        first = np.concatenate(([0], np.cumsum(inner)[:-1]))
+        index = lo[interval] + 1 + np.arange(len(interval)) - first[interval]
+        distance = _segment_distance(points[index], points[lo[interval]], points[hi[interval]])
+
+        # 구간별 가장 먼 점: 최댓값과 같은 첫 점
+        farthest = np.maximum.reduceat(distance, first)
+        is_max = distance == farthest[interval]
+        split = index[np.flatnonzero(is_max)[np.unique(interval[is_max], return_index=True)[1]]]
+
+        # tolerance보다 먼 점은 남기고 그 점을 기준으로 두 구간으로 나눔
+        far = farthest > tolerance
+        split, lo, hi = split[far], lo[far], hi[far]
+        keep[split] = True
+        lo, hi = np.concatenate((lo, split)), np.concatenate((split, hi))
+
+    # flatten_paths()의 polyline은 점이 하나 이상이므로 reduceat으로 path별 남은 점 수를 셀 수 있음
+    new_offsets = np.zeros(len(offsets), dtype=np.int64)
+    if len(offsets) > 1:
+        new_offsets[1:] = np.cumsum(np.add.reduceat(keep.astype(np.int64), offsets[:-1]))
+    removed = int(n - keep.sum())
+    return points[keep], new_offsets, removed
@@ -1,88 +1,168 @@
 # svg_parser.py
-from svgpathtools import svg2paths, Line, CubicBezier, QuadraticBezier, Arc
+import math
+from svgpathtools import parse_path, Line, CubicBezier, QuadraticBezier, Arc
+from svgpathtools.svg_to_paths import ellipse2pathd, line2pathd, polyline2pathd, polygon2pathd, rect2pathd
 import xml.etree.ElementTree as ET
+from segments import SegmentStore, SEG_LINE, SEG_QUAD, SEG_CUBIC, SEG_ARC, SEG_CIRCLE, SEG_CLOSE
+from transforms import UNITS, element_matrix, scale, transform_record, transform_segments, segment_bounds, fit_matrix
 
-def parse_svg(file_path):
-    paths, attributes = svg2paths(file_path)
-    parsed_paths = []
-
-    # ----- 일반 path 처리 -----
-    for path in paths:
-        path_data = []
-
-        #   1. 경로의 시작점 (M)을 첫 세그먼트 시작 전에 명시적으로 추가
-        # path[0].start는 항상 첫 번째 세그먼트의 시작점을 나타냅니다.
-        if len(path) > 0:
-            start_point = (path[0].start.real, path[0].start.imag)
-            path_data.append({
-                "type": "M",
-                "start": start_point, 
-                "end": start_point # M 명령은 제자리 이동으로 기록
-            })
-
-        #   2. 실제 세그먼트들 (L, C, Q, A) 처리 (M 명령 처리는 생략)
-        for segment in path:
+# 도형 요소 → path d 문자열 변환 (circle은 'circle' 세그먼트로 따로 처리)
+SHAPE_TO_PATHD = {
+    "path": lambda elem: elem.get('d', ''),
+    "ellipse": ellipse2pathd,
+    "line": line2pathd,
+    "polyline": polyline2pathd,
+    "polygon": polygon2pathd,
+    "rect": rect2pathd,
+}
+
+# 이 요소 안의 도형은 직접 그려지지 않음
+NON_RENDERED = {"defs", "clipPath", "mask", "marker", "pattern", "symbol"}
+
+
+def _local_name(tag):
+    # '{http://www.w3.org/2000/svg}path' → 'path'
+    return tag.rsplit('}', 1)[-1]
+
+
+# ----- svgpathtools Path → 세그먼트 배열 -----
+def _path_records(path):
+    # 끊어진 subpath(M이 여러 번)는 각각 별도의 path로 나눔
+    for subpath in path.continuous_subpaths():
+        if len(subpath) == 0:
+            continue
+        kinds = []
+        ctrl = []
+
+        #   1. 경로의 시작점 (M)은 path별 시작점으로 저장
+        start = (subpath[0].start.real, subpath[0].start.imag)
+
+        #   2. 실제 세그먼트들 (L, C, Q, A) 처리
+        for segment in subpath:
             if isinstance(segment, Line):
-                path_data.append({
-                    "type": "L",
-                    "start": (segment.start.real, segment.start.imag),
-                    "end": (segment.end.real, segment.end.imag)
-                })
+                end = (segment.end.real, segment.end.imag)
+                kinds.append(SEG_LINE)
+                ctrl.append(((segment.start.real, segment.start.imag), end, end, end))
 
             elif isinstance(segment, CubicBezier):
-                path_data.append({
-                    "type": "C",
-                    "start": (segment.start.real, segment.start.imag),
-                    "control1": (segment.control1.real, segment.control1.imag),
-                    "control2": (segment.control2.real, segment.control2.imag),
-                    "end": (segment.end.real, segment.end.imag)
-                })
+                kinds.append(SEG_CUBIC)
+                ctrl.append(((segment.start.real, segment.start.imag),
+                             (segment.control1.real, segment.control1.imag),
+                             (segment.control2.real, segment.control2.imag),
+                             (segment.end.real, segment.end.imag)))
 
             elif isinstance(segment, QuadraticBezier):
-                path_data.append({
-                    "type": "Q",
-                    "start": (segment.start.real, segment.start.imag),
-                    "control": (segment.control.real, segment.control.imag),
-                    "end": (segment.end.real, segment.end.imag)
-                })
+                end = (segment.end.real, segment.end.imag)
+                kinds.append(SEG_QUAD)
+                ctrl.append(((segment.start.real, segment.start.imag),
+                             (segment.control.real, segment.control.imag),
+                             end, end))
 
             elif isinstance(segment, Arc):
-                path_data.append({
-                    "type": "A",
-                    "start": (segment.start.real, segment.start.imag),
-                    "end": (segment.end.real, segment.end.imag),
-                    "radius": (segment.radius.real, segment.radius.imag),
-                    "center": (segment.center.real, segment.center.imag),
-                })
-
-# 닫힌 경로 처리 (Z)
-        if path.isclosed() and path_data:
-            first_segment_start = path_data[0]['end'] # M 명령의 end (첫 시작점)
-
-            path_data.append({
-                "type": "Z",
-                #   보정 없이 SVG가 파싱한 그대로의 마지막 끝점을 start로 사용
-                "start": (path[-1].end.real, path[-1].end.imag), 
-                "end": first_segment_start
-            })
-
-        parsed_paths.append(path_data)
-
-    # ----- circle 요소 추가 처리 -----
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-    # 네임스페이스 정의를 반드시 포함
-    ns = {'svg': 'http://www.w3.org/2000/svg'}
-
-    for circle in root.findall(".//svg:circle", ns):
-        cx = float(circle.attrib.get('cx', 0))
-        cy = float(circle.attrib.get('cy', 0))
-        r = float(circle.attrib.get('r', 0))
-        path_data = [{
-            "type": "circle",
-            "center": (cx, cy),
-            "radius": r
-        }]
-        parsed_paths.append(path_data)
-
-    return parsed_paths
\ No newline at end of file
+                rotation = segment.rotation % 180
+                if min(rotation, 180 - rotation) > 1e-9 and not math.isclose(segment.radius.real, segment.radius.imag):
+                    # 기울어진 타원 원호는 (중심, 축 방향 반지름)으로 나타낼 수 없으므로 3차 베지어로 바꿈
+                    for piece in _arc_cubics(segment):
+                        kinds.append(SEG_CUBIC)
+                        ctrl.append(piece)
+                    continue
+                # 그리는 방향은 반지름의 부호로 저장: sweep-flag=1(각도 증가)이면 양수, 0이면 음수
+                sign = 1.0 if segment.sweep else -1.0
+                kinds.append(SEG_ARC)
+                ctrl.append(((segment.start.real, segment.start.imag),
+                             (segment.end.real, segment.end.imag),
+                             (segment.center.real, segment.center.imag),
+                             (sign * segment.radius.real, sign * segment.radius.imag)))
+
+        #   3. 닫힌 경로 처리 (Z): 보정 없이 SVG가 파싱한 그대로의 마지막 끝점을 start로 사용
+        if subpath.isclosed():
+            kinds.append(SEG_CLOSE)
+            ctrl.append(((subpath[-1].end.real, subpath[-1].end.imag), start, start, start))
+
+        yield kinds, ctrl, start
+
+def _arc_cubics(arc):
+    # svgpathtools Arc를 90도 이하 조각마다 3차 베지어 하나로 근사 (조각 양 끝의 점과 접선이 원호와 같음)
+    n = max(1, math.ceil(abs(arc.delta) / 90 - 1e-9))
+    # derivative(t)는 t(0~1)에 대한 미분이므로 각도 미분으로 바꾼 뒤 4/3·tan(조각 각도/4)를 곱함
+    k = 4 / 3 * math.tan(math.radians(arc.delta) / n / 4) / math.radians(arc.delta)
+    pieces = []
+    for i in range(n):
+        p0, p3 = arc.point(i / n), arc.point((i + 1) / n)
+        p1, p2 = p0 + k * arc.derivative(i / n), p3 - k * arc.derivative((i + 1) / n)
+        pieces.append(tuple((p.real, p.imag) for p in (p0, p1, p2, p3)))
+    # 이어지는 세그먼트와 끊기지 않도록 양 끝은 원래 점을 그대로 사용
+    pieces[0] = ((arc.start.real, arc.start.imag), *pieces[0][1:])
+    pieces[-1] = (*pieces[-1][:3], (arc.end.real, arc.end.imag))
+    return pieces
+
+def _circle_record(attrib):
+    cx = float(attrib.get('cx', 0))
+    cy = float(attrib.get('cy', 0))
+    r = float(attrib.get('r', 0))
+    return [SEG_CIRCLE], [((cx + r, cy), (cx + r, cy), (cx, cy), (r, r))], (cx + r, cy)
+
+
+# ----- 스트리밍 파싱 -----
+def iter_svg_records(file_path, unit="px"):
+    # iterparse로 파일을 한 번만 읽으면서, 도형 요소가 끝날 때마다 (kinds, ctrl, start)를 바로 내보냄
+    # 처리한 요소는 비우고 부모에서 떼어내서 DOM 전체가 메모리에 쌓이지 않게 함
+    # 좌표는 transform/viewBox/width·height를 모두 적용한 unit 단위 (px, mm, cm, in, pt, pc)
+    stack = []
+    matrices = [scale(1 / UNITS[unit])]
+    hidden = 0
+
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        tag = _local_name(elem.tag)
+
+        if event == "start":
+            # 부모까지 누적된 행렬에 이 요소의 transform을 곱해 둠 (요소마다 한 번)
+            matrices.append(element_matrix(tag, elem.attrib, matrices[-1], root=not stack))
+            stack.append(elem)
+            if tag in NON_RENDERED:
+                hidden += 1
+            continue
+
+        stack.pop()
+        matrix = matrices.pop()
+        if tag in NON_RENDERED:
+            hidden -= 1
+        elif not hidden:
+            if tag == "circle":
+                yield transform_record(*_circle_record(elem.attrib), matrix)
+            elif tag in SHAPE_TO_PATHD:
+                d = SHAPE_TO_PATHD[tag](elem)
+                if d:
+                    for record in _path_records(parse_path(d)):
+                        yield transform_record(*record, matrix)
+
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+def iter_svg(file_path, unit="px"):
+    # path를 읽는 즉시 하나씩 기존 dict 목록 형식으로 내보냄 (execute_path에 바로 넘길 수 있음)
+    for kinds, ctrl, start in iter_svg_records(file_path, unit):
+        yield SegmentStore(kinds, ctrl, [0, len(kinds)], [start]).path(0)
+
+def parse_svg(file_path, unit="px", paper_size=None, margin=1.0):
+    # 결과는 SegmentStore (세그먼트 종류 코드 + (S, 4, 2) 제어점 배열 + path 경계)
+    # 기존처럼 store[i]로 path를 꺼내면 M/L/C/Q/A/Z dict 목록으로 변환되어 반환됨
+    # paper_size=(가로, 세로)를 unit 단위로 주면 그림 전체를 비율을 유지한 채 종이의 여백(margin) 안에 맞춤
+    kinds = []
+    ctrl = []
+    path_offsets = [0]
+    starts = []
+
+    for path_kinds, path_ctrl, start in iter_svg_records(file_path, unit):
+        kinds.extend(path_kinds)
+        ctrl.extend(path_ctrl)
+        starts.append(start)
+        path_offsets.append(len(kinds))
+
+    store = SegmentStore(kinds, ctrl, path_offsets, starts)
+    if paper_size is not None and len(store.kinds):
+        matrix = fit_matrix(segment_bounds(store.kinds, store.ctrl, store.starts), paper_size, margin)
+        store.ctrl, store.starts = transform_segments(store.kinds, store.ctrl, store.starts, matrix,
+                                                      store.path_offsets)
+    return store
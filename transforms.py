@@ -0,0 +1,233 @@
+# transforms.py
+# SVG의 transform 속성, viewBox, 단위(mm, cm, in, ...)를 3x3 affine 행렬로 계산하고
+# 요소마다 한 번씩 제어점 배열 전체에 적용하는 모듈 (그 뒤로는 좌표를 다시 변환할 필요 없음)
+import re
+import math
+import numpy as np
+from segments import SEG_CUBIC, SEG_ARC, SEG_CIRCLE
+
+# 단위 → CSS px (1in = 96px)
+UNITS = {"px": 1.0, "in": 96.0, "cm": 96.0 / 2.54, "mm": 96.0 / 25.4, "pt": 96.0 / 72, "pc": 16.0}
+
+IDENTITY = np.eye(3)
+
+_NUMBER = re.compile(r"[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?")
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_LENGTH = re.compile(r"^\s*(" + _NUMBER.pattern + r")\s*([a-z%]*)\s*$")
+
+
+# --- 기본 행렬 ---
+def translate(tx, ty=0.0):
+    return np.array([[1.0, 0.0, tx], [0.0, 1.0, ty], [0.0, 0.0, 1.0]])
+
+def scale(sx, sy=None):
+    sy = sx if sy is None else sy
+    return np.array([[sx, 0.0, 0.0], [0.0, sy, 0.0], [0.0, 0.0, 1.0]])
+
+def rotate(degree, cx=0.0, cy=0.0):
+    rad = math.radians(degree)
+    c, s = math.cos(rad), math.sin(rad)
+    m = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    return translate(cx, cy) @ m @ translate(-cx, -cy)
+
+
+# --- 속성 파싱 ---
+def parse_transform(text):
+    # 'translate(10 20) rotate(45)' → 왼쪽부터 차례로 곱한 행렬 (SVG 규칙)
+    matrix = IDENTITY
+    if not text:
+        return matrix
+    for name, args in _TRANSFORM.findall(text):
+        values = [float(v) for v in _NUMBER.findall(args)]
+        if name == "matrix" and len(values) == 6:
+            a, b, c, d, e, f = values
+            m = np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
+        elif name == "translate" and values:
+            m = translate(*values[:2])
+        elif name == "scale" and values:
+            m = scale(*values[:2])
+        elif name == "rotate" and values:
+            m = rotate(values[0], *values[1:3]) if len(values) >= 3 else rotate(values[0])
+        elif name == "skewX" and values:
+            m = np.array([[1.0, math.tan(math.radians(values[0])), 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        elif name == "skewY" and values:
+            m = np.array([[1.0, 0.0, 0.0], [math.tan(math.radians(values[0])), 1.0, 0.0], [0.0, 0.0, 1.0]])
+        else:
+            continue
+        matrix = matrix @ m
+    return matrix
+
+def parse_length(text, default=None):
+    # '210mm' → px, 숫자만 있으면 px, %나 모르는 단위는 default
+    if text is None:
+        return default
+    match = _LENGTH.match(text)
+    if match is None or match.group(2) not in UNITS and match.group(2) != "":
+        return default
+    return float(match.group(1)) * UNITS.get(match.group(2), 1.0)
+
+def viewport_matrix(attrib):
+    # <svg>의 width/height/viewBox/preserveAspectRatio → 사용자 좌표에서 px로 가는 행렬
+    view_box = [float(v) for v in _NUMBER.findall(attrib.get("viewBox", ""))]
+    if len(view_box) != 4 or view_box[2] <= 0 or view_box[3] <= 0:
+        return IDENTITY
+    vx, vy, vw, vh = view_box
+    width = parse_length(attrib.get("width"), vw)
+    height = parse_length(attrib.get("height"), vh)
+
+    sx, sy = width / vw, height / vh
+    align, _, meet_or_slice = attrib.get("preserveAspectRatio", "xMidYMid meet").strip().partition(" ")
+    if align == "none":
+        return scale(sx, sy) @ translate(-vx, -vy)
+
+    s = max(sx, sy) if meet_or_slice.strip() == "slice" else min(sx, sy)
+    tx = {"xMin": 0.0, "xMid": 0.5, "xMax": 1.0}.get(align[:4], 0.5) * (width - vw * s)
+    ty = {"YMin": 0.0, "YMid": 0.5, "YMax": 1.0}.get(align[4:], 0.5) * (height - vh * s)
+    return translate(tx, ty) @ scale(s) @ translate(-vx, -vy)
+
+def element_matrix(tag, attrib, parent, root=False):
+    # 부모까지 누적된 행렬에 이 요소의 transform(과 <svg>면 viewport)을 곱함
+    matrix = parent
+    if tag == "svg":
+        if not root:
+            matrix = matrix @ translate(parse_length(attrib.get("x"), 0.0), parse_length(attrib.get("y"), 0.0))
+        matrix = matrix @ viewport_matrix(attrib)
+    if "transform" in attrib:
+        matrix = matrix @ parse_transform(attrib["transform"])
+    return matrix
+
+
+# --- 자동 맞춤 ---
+def segment_bounds(kinds, ctrl, starts):
+    # 그림 전체의 (xmin, ymin, xmax, ymax): 베지어는 제어점, 원호/원은 중심 ± 반지름으로 넉넉하게 잡음
+    kinds = np.asarray(kinds)
+    ctrl = np.asarray(ctrl, dtype=np.float64).reshape(-1, 4, 2)
+    is_arc = (kinds == SEG_ARC) | (kinds == SEG_CIRCLE)
+    points = [np.asarray(starts, dtype=np.float64).reshape(-1, 2), ctrl[~is_arc].reshape(-1, 2),
+              ctrl[is_arc, 2] - np.abs(ctrl[is_arc, 3]), ctrl[is_arc, 2] + np.abs(ctrl[is_arc, 3])]
+    points = np.concatenate(points)
+    if len(points) == 0:
+        return None
+    return (*points.min(axis=0), *points.max(axis=0))
+
+def fit_matrix(bounds, paper_size, margin=1.0):
+    # bounds를 비율을 유지한 채 (가로, 세로) 종이의 여백 안에 가운데 맞춤
+    xmin, ymin, xmax, ymax = bounds
+    width, height = paper_size[0] - 2*margin, paper_size[1] - 2*margin
+    if width <= 0 or height <= 0:
+        raise ValueError(f"여백이 종이보다 큽니다: paper_size={paper_size}, margin={margin}")
+    w, h = xmax - xmin, ymax - ymin
+    if w <= 0 and h <= 0:
+        return translate(paper_size[0] / 2 - xmin, paper_size[1] / 2 - ymin)
+    s = min(width / w if w > 0 else math.inf, height / h if h > 0 else math.inf)
+    return (translate(margin + (width - w*s) / 2, margin + (height - h*s) / 2)
+            @ scale(s) @ translate(-xmin, -ymin))
+
+
+# --- 제어점 변환 ---
+def _is_identity(matrix):
+    return np.allclose(matrix, IDENTITY, rtol=0, atol=1e-12)
+
+def _axis_aligned(linear):
+    return abs(linear[0, 1]) < 1e-12 and abs(linear[1, 0]) < 1e-12
+
+def _keeps_arcs(matrix, kinds, radius):
+    # 변환 뒤에도 (중심, 축 방향 반지름) 형식으로 나타낼 수 있는 원호인지 (radius: (k, 2))
+    # 원호의 시작/끝 각도는 중심에서 본 방향(atan2)이라 가로/세로 배율이 다르면 바뀌므로 배율이 같아야 함
+    # (circle도 반지름 하나로 저장되므로 마찬가지)
+    (a, c), (b, d) = matrix[:2, :2]
+    if _axis_aligned(matrix[:2, :2]) and a > 0 and d > 0:
+        return np.full(len(kinds), math.isclose(a, d))
+    similar = math.isclose(a, d, abs_tol=1e-12) and math.isclose(b, -c, abs_tol=1e-12) and a*d - b*c > 0
+    return np.isclose(radius[:, 0], radius[:, 1]) if similar else np.zeros(len(radius), dtype=bool)
+
+def _arc_to_cubics(kind, ctrl):
+    # flatten과 같은 규칙(radius 부호에 따라 시작각에서 각도가 커지거나 작아지는 방향, circle은 0~360도)의
+    # 원호를 90도 이하 3차 베지어로 바꿈
+    start, end, center, (rx, ry) = ctrl
+    increasing = rx > 0
+    rx, ry = abs(rx), abs(ry)
+    if kind == SEG_CIRCLE:
+        a0, a1 = 0.0, 2*math.pi
+    else:
+        a0 = math.atan2(start[1] - center[1], start[0] - center[0])
+        a1 = math.atan2(end[1] - center[1], end[0] - center[0])
+        if increasing and a1 < a0:
+            a1 += 2*math.pi
+        elif not increasing and a1 > a0:
+            a1 -= 2*math.pi
+    n = max(1, math.ceil(abs(a1 - a0) / (math.pi / 2) - 1e-9))
+    angles = np.linspace(a0, a1, n + 1)
+    k = 4 / 3 * math.tan((a1 - a0) / n / 4)
+    point = lambda t: np.array([center[0] + rx*math.cos(t), center[1] + ry*math.sin(t)])
+    tangent = lambda t: np.array([-rx*math.sin(t), ry*math.cos(t)])
+
+    pieces = []
+    for t0, t1 in zip(angles[:-1], angles[1:]):
+        p0, p3 = point(t0), point(t1)
+        pieces.append((p0, p0 + k*tangent(t0), p3 - k*tangent(t1), p3))
+    # 이어지는 세그먼트와 끊기지 않도록 양 끝은 원래 점을 그대로 사용
+    pieces[0] = (np.asarray(start), *pieces[0][1:])
+    pieces[-1] = (*pieces[-1][:3], np.asarray(end))
+    return pieces
+
+def transform_record(kinds, ctrl, start, matrix):
+    # path 하나의 (kinds, ctrl, start)에 행렬을 한 번에 적용
+    # 원호/원은 중심을 옮기고 반지름을 늘리며, 그렇게 나타낼 수 없는 변환(기울이기, 뒤집기 등)이면 3차 베지어로 바꿈
+    if _is_identity(matrix):
+        return kinds, ctrl, start
+    kinds = np.asarray(kinds, dtype=np.int8)
+    ctrl = np.asarray(ctrl, dtype=np.float64).reshape(-1, 4, 2)
+
+    is_arc = (kinds == SEG_ARC) | (kinds == SEG_CIRCLE)
+    if is_arc.any():
+        convert = np.zeros(len(kinds), dtype=bool)
+        convert[is_arc] = ~_keeps_arcs(matrix, kinds[is_arc], ctrl[is_arc, 3])
+        if convert.any():
+            new_kinds, new_ctrl = [], []
+            for kind, seg_ctrl, flag in zip(kinds, ctrl, convert):
+                if flag:
+                    pieces = _arc_to_cubics(kind, seg_ctrl)
+                    new_kinds.extend([SEG_CUBIC] * len(pieces))
+                    new_ctrl.extend(pieces)
+                else:
+                    new_kinds.append(kind)
+                    new_ctrl.append(seg_ctrl)
+            kinds = np.asarray(new_kinds, dtype=np.int8)
+            ctrl = np.asarray(new_ctrl, dtype=np.float64).reshape(-1, 4, 2)
+            is_arc = (kinds == SEG_ARC) | (kinds == SEG_CIRCLE)
+
+    ctrl, starts = transform_segments(kinds, ctrl, [start], matrix)
+    return kinds, ctrl, tuple(starts[0])
+
+def transform_segments(kinds, ctrl, starts, matrix, path_offsets=None):
+    # 세그먼트 배열 전체에 행렬 적용 (원호/원은 중심/반지름 형식으로 나타낼 수 있는 변환이어야 함)
+    # path_offsets가 없으면 starts는 path 하나의 시작점
+    kinds = np.asarray(kinds)
+    ctrl = np.asarray(ctrl, dtype=np.float64).reshape(-1, 4, 2)
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    is_arc = (kinds == SEG_ARC) | (kinds == SEG_CIRCLE)
+
+    linear, offset = matrix[:2, :2], matrix[:2, 2]
+    out = np.empty_like(ctrl)
+    out[~is_arc] = ctrl[~is_arc] @ linear.T + offset
+    out[is_arc, :3] = ctrl[is_arc, :3] @ linear.T + offset
+    # 원호 반지름: 축 방향 scale이면 축별로, 회전+균일 scale이면 배율만큼
+    if _axis_aligned(linear):
+        out[is_arc, 3] = ctrl[is_arc, 3] * np.abs(np.diag(linear))
+    else:
+        out[is_arc, 3] = ctrl[is_arc, 3] * math.sqrt(abs(np.linalg.det(linear)))
+    starts = starts @ linear.T + offset
+
+    # circle은 항상 중심 오른쪽 점에서 시작하므로 회전했으면 시작점을 다시 잡음
+    is_circle = kinds == SEG_CIRCLE
+    if is_circle.any():
+        circle_start = out[is_circle, 2] + out[is_circle, 3] * [1.0, 0.0]
+        out[is_circle, 0] = circle_start
+        out[is_circle, 1] = circle_start
+        offsets = np.array([0, len(kinds)]) if path_offsets is None else np.asarray(path_offsets)
+        paths = np.nonzero(np.diff(offsets) > 0)[0]
+        first = offsets[paths]
+        circle_paths = kinds[first] == SEG_CIRCLE
+        starts[paths[circle_paths]] = out[first[circle_paths], 0]
+    return out, starts
@@ -1,7 +1,10 @@
 # utils.py
 import math
-import numpy as np
-from roboid import * # --- 기본 계산 함수 (동일) ---
+from collections.abc import Iterator
+from motion_plan import plan_move, compile_plan, iter_plan, run_commands
+from dispatcher import dispatch
+
+# --- 기본 계산 함수 (동일) ---
 def calculate_distance(start, end):
     return math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
 
@@ -28,16 +31,7 @@ def quadratic_bezier_curve(p0, p1, p2, steps=10):
 
 # --- 이동 함수 (동일) ---
 def move_to(h, start, end, current_angle, scale=0.07, angle_offset=0):
-    distance = calculate_distance(start, end) * scale
-    target_angle = calculate_angle(start, end)
-
-    target_angle += angle_offset
-
-    angle_diff = target_angle - current_angle
-    if angle_diff > 180:
-        angle_diff -= 360  
-    elif angle_diff < -180:
-        angle_diff += 360  
+    angle_diff, distance, target_angle = plan_move(start, end, current_angle, scale, angle_offset)
 
     if angle_diff > 0:
         h.turn_right(abs(angle_diff))
@@ -49,82 +43,18 @@ def move_to(h, start, end, current_angle, scale=0.07, angle_offset=0):
     return target_angle
 
 # --- HamsterS로 path 실행 ---
-def execute_path(h, parsed_paths, scale=0.07, steps_bezier=10, steps_arc=10, angle_offset=0): 
-    # M 명령이 첫 세그먼트이므로, 그 시작점을 초기 위치로 설정
-    current_position = parsed_paths[0][0]['start'] 
-    current_angle = 0 
-
-    for path_index, path in enumerate(parsed_paths):
-        print(f"Starting Path {path_index+1}...")
-
-        for segment in path:
-            seg_type = segment['type']
-
-            # M 명령: 위치만 갱신하고 이동(move_to) 건너뛰기
-            if seg_type == 'M': 
-                current_position = segment['end'] 
-                continue
-
-            elif seg_type == 'L': 
-                end = segment['end']
-                current_angle = move_to(h, current_position, end, current_angle, scale, angle_offset)
-                current_position = end
-
-            elif seg_type == 'C': 
-                points = cubic_bezier_curve(segment['start'], segment['control1'], segment['control2'], segment['end'], steps_bezier)
-                for i in range(1, len(points)):
-                    current_angle = move_to(h, points[i-1], points[i], current_angle, scale, angle_offset)
-                current_position = segment['end']
-
-            elif seg_type == 'Q': 
-                points = quadratic_bezier_curve(segment['start'], segment['control'], segment['end'], steps_bezier)
-                for i in range(1, len(points)):
-                    current_angle = move_to(h, points[i-1], points[i], current_angle, scale, angle_offset)
-                current_position = segment['end']
-
-            elif seg_type == 'A': 
-                cx, cy = segment['center']
-                rx, ry = segment['radius']
-                start_point = segment['start']
-                end_point = segment['end']
-                
-                start_angle = math.degrees(math.atan2(start_point[1]-cy, start_point[0]-cx))
-                end_angle = math.degrees(math.atan2(end_point[1]-cy, end_point[0]-cx))
-                if end_angle < start_angle:
-                    end_angle += 360 
-
-                angles = np.linspace(start_angle, end_angle, steps_arc)
-                points = [(cx + rx*math.cos(math.radians(a)), cy + ry*math.sin(math.radians(a))) for a in angles]
-                for i in range(1, len(points)):
-                    current_angle = move_to(h, points[i-1], points[i], current_angle, scale, angle_offset)
-                current_position = points[-1]
-
-            elif seg_type == 'Z': 
-                end = segment['end']
-                current_angle = move_to(h, current_position, end, current_angle, scale, angle_offset)
-                current_position = end
-
-
-            elif seg_type == 'circle': 
-                cx, cy = segment['center']
-                r = segment['radius']
-                angles = np.linspace(0, 360, steps_arc)
-                points = [(cx + r*math.cos(math.radians(a)), cy + r*math.sin(math.radians(a))) for a in angles]
-                for i in range(1, len(points)):
-                    current_angle = move_to(h, points[i-1], points[i], current_angle, scale, angle_offset)
-                current_position = points[-1]
-
-        print(f"Path {path_index+1} completed.\n")
-
-        #   다음 path로 이동 (KeyError 방지 로직 추가)
-        if path_index + 1 < len(parsed_paths):
-            next_path = parsed_paths[path_index+1]
-            
-            # 다음 경로가 리스트이고, 첫 요소가 'start' 키를 가질 때만 이동 로직 실행
-            if isinstance(next_path, list) and next_path and 'start' in next_path[0]:
-                next_path_start = next_path[0]['start']
-                
-                # 현재 위치와 다음 시작점이 다를 경우에만 이동
-                if current_position != next_path_start:
-                    current_angle = move_to(h, current_position, next_path_start, current_angle, scale, angle_offset)
-                    current_position = next_path_start
\ No newline at end of file
+def execute_path(h, parsed_paths, scale=0.07, steps_bezier=10, steps_arc=10, angle_offset=0, tolerance=0.1,
+                 min_distance=0.01, min_angle=0.1, lookahead=64, on_progress=None, arc_tolerance=None,
+                 simplify_tolerance=None, reverse=False, cancelled=None):
+    # cancelled: threading.Event, 다른 스레드에서 set()하면 현재 명령이 끝난 뒤 멈춤 (iterator를 넘기면 on_progress에서도 가능)
+    if isinstance(parsed_paths, Iterator):
+        # iter_svg() 같은 iterator: 파일을 다 읽기 전에 첫 path부터 바로 그리기 시작
+        # 파싱/근사/계획은 별도 스레드에서 최대 lookahead개 명령만큼 앞서 계산
+        plan = iter_plan(parsed_paths, scale, steps_bezier, steps_arc, angle_offset, tolerance,
+                         min_distance, min_angle, arc_tolerance, simplify_tolerance, reverse)
+        return dispatch(h, plan, lookahead, on_progress, cancelled)
+
+    # 명령 목록을 먼저 모두 계산(compile)한 뒤 로봇에서 그대로 재생
+    plan = compile_plan(parsed_paths, scale, steps_bezier, steps_arc, angle_offset, tolerance,
+                        min_distance, min_angle, arc_tolerance, simplify_tolerance, reverse)
+    run_commands(h, plan, cancelled)